@@ -1,15 +1,125 @@
 import logging
 import json
+import itertools
 import os
 from datetime import datetime, timezone
+from pathlib import Path
 from typing import Dict, Any, List
-import azure.functions as func
 import asyncio
-import sys
+from ..shared.clients.azure_ai_client import get_content_understanding_client
+from ..shared.utils.config import Config
 
-# Add shared folder to path
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from shared.clients.azure_ai_client import get_content_understanding_client
+
+# Simulated analysis IDs: prefix + instance + worker process + worker start
+# time + per-worker sequence number, unique even for concurrent calls in one
+# second and across the worker processes of one instance
+_ANALYSIS_ID_PREFIX = "analysis_{}_{}_{}_".format(
+    os.environ.get("WEBSITE_INSTANCE_ID", "local")[:8],
+    os.getpid(),
+    datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
+)
+_analysis_counter = itertools.count(1)
+
+# Analyzer definition used for every video, unless overridden in settings
+_ANALYZER_TEMPLATE_PATH = Config.ANALYZER_TEMPLATE_PATH or str(
+    Path(__file__).resolve().parents[2] / "analyzer_templates" / "video_content_understanding.json"
+)
+
+# Constant part of the simulated analysis, shared by every call.
+# Lists are tuples so the shared template cannot be mutated by accident.
+_SIMULATED_INSIGHTS = {
+    "transcript": {
+        "language": "es-ES",
+        "confidence": 0.92,
+        "text": "Bienvenidos a este vídeo tutorial sobre Azure Functions y procesamiento de vídeo. En este contenido aprenderemos sobre las mejores prácticas para implementar soluciones escalables.",
+        "segments": (
+            {
+                "start_time": 0.0,
+                "end_time": 5.2,
+                "text": "Bienvenidos a este vídeo tutorial sobre Azure Functions",
+                "confidence": 0.94
+            },
+            {
+                "start_time": 5.2,
+                "end_time": 12.8,
+                "text": "y procesamiento de vídeo. En este contenido aprenderemos",
+                "confidence": 0.91
+            },
+            {
+                "start_time": 12.8,
+                "end_time": 18.5,
+                "text": "sobre las mejores prácticas para implementar soluciones escalables.",
+                "confidence": 0.89
+            }
+        )
+    },
+    "keyframes": (
+        {
+            "time": 0.0,
+            "confidence": 0.95,
+            "description": "Pantalla de título con logo de Azure"
+        },
+        {
+            "time": 30.0,
+            "confidence": 0.88,
+            "description": "Diagrama de arquitectura de Azure Functions"
+        },
+        {
+            "time": 60.0,
+            "confidence": 0.92,
+            "description": "Código fuente en VS Code"
+        }
+    ),
+    "labels": (
+        {"name": "azure", "confidence": 0.95, "count": 12},
+        {"name": "functions", "confidence": 0.92, "count": 8},
+        {"name": "cloud", "confidence": 0.89, "count": 6},
+        {"name": "desarrollo", "confidence": 0.87, "count": 5},
+        {"name": "tutorial", "confidence": 0.85, "count": 4}
+    ),
+    "faces": (
+        {
+            "id": "face_1",
+            "name": "Presenter",
+            "confidence": 0.87,
+            "appearances": (
+                {"start": 10.0, "end": 45.0},
+                {"start": 80.0, "end": 120.0}
+            )
+        },
+    ),
+    "emotions": (
+        {"name": "neutral", "confidence": 0.75, "avg_score": 0.65},
+        {"name": "happiness", "confidence": 0.20, "avg_score": 0.25},
+        {"name": "focused", "confidence": 0.82, "avg_score": 0.78}
+    ),
+    "topics": (
+        {"name": "Azure Functions", "confidence": 0.94, "relevance": 0.89},
+        {"name": "Cloud Computing", "confidence": 0.91, "relevance": 0.85},
+        {"name": "Video Processing", "confidence": 0.88, "relevance": 0.82},
+        {"name": "Software Development", "confidence": 0.85, "relevance": 0.78}
+    ),
+    "scenes": (
+        {
+            "id": "scene_1",
+            "start": 0.0,
+            "end": 30.0,
+            "description": "Introducción y presentación del tutorial"
+        },
+        {
+            "id": "scene_2", 
+            "start": 30.0,
+            "end": 90.0,
+            "description": "Explicación técnica de Azure Functions"
+        },
+        {
+            "id": "scene_3",
+            "start": 90.0,
+            "end": 120.0,
+            "description": "Demostración práctica y conclusiones"
+        }
+    )
+}
 
 
 async def main(input_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -25,22 +135,24 @@ async def main(input_data: Dict[str, Any]) -> Dict[str, Any]:
     logging.info(f"Analyzing video content for: {video_info.get('blob_name')}")
     
     try:
-        # Get Azure Content Understanding client
-        ai_client = get_content_understanding_client()
-        
         # Check if we have proper configuration
-        if not os.environ.get("AZURE_AI_SERVICE_ENDPOINT"):
+        if not Config.AZURE_AI_SERVICE_ENDPOINT:
             # For development, return simulated analysis
             logging.info("No AI endpoint configured, returning simulated analysis")
             return simulate_video_analysis(video_info, metadata)
         
-        # Analyze video using official client
+        # Get Azure Content Understanding client
+        ai_client = get_content_understanding_client()
+        
+        # Analyze video using official client. The client submits and polls
+        # with blocking HTTP calls and sleeps, so it runs in a worker thread
+        # to keep the event loop free for other activities.
         video_url = video_info.get('blob_url')
-        analysis_result = await ai_client.analyze_video(
+        analysis_result = await asyncio.to_thread(
+            ai_client.analyze_video,
             video_url=video_url,
             video_name=video_info.get('blob_name'),
-            include_transcript=True,
-            include_insights=True
+            analyzer_template_path=_ANALYZER_TEMPLATE_PATH
         )
         
         logging.info(f"Video analysis completed for: {video_info.get('blob_name')}")
@@ -51,153 +163,20 @@ async def main(input_data: Dict[str, Any]) -> Dict[str, Any]:
         raise Exception(f"Video analysis failed: {str(e)}")
 
 
-def prepare_analysis_request(video_info: Dict[str, Any], metadata: Dict[str, Any]) -> Dict[str, Any]:
-    """
-    Prepare the request payload for Azure AI Video Analysis.
-    """
-    return {
-        "video_url": video_info.get('blob_url'),
-        "video_name": video_info.get('blob_name'),
-        "analysis_options": {
-            "extractInsights": True,
-            "extractKeyframes": True,
-            "extractFaces": True,
-            "extractLabels": True,
-            "extractBrands": True,
-            "extractSentiments": True,
-            "extractTranscript": True,
-            "extractOcr": True,
-            "extractScenes": True,
-            "extractTopics": True
-        },
-        "metadata": metadata
-    }
-
-
-async def submit_video_analysis(ai_endpoint: str, api_version: str, analysis_request: Dict[str, Any]) -> Dict[str, Any]:
-    """
-    Submit video to Azure AI for analysis and wait for results.
-    """
-    # This is a placeholder for the actual Azure AI Video Indexer API call
-    # In a real implementation, you would:
-    # 1. Submit the video URL to Azure AI Video Indexer
-    # 2. Poll for completion status
-    # 3. Retrieve the analysis results
-    
-    # For now, we'll simulate the API call and return mock results
-    await asyncio.sleep(2)  # Simulate processing time
-    
-    return simulate_video_analysis(
-        {"blob_name": analysis_request.get("video_name")}, 
-        analysis_request.get("metadata", {})
-    )
-
-
 def simulate_video_analysis(video_info: Dict[str, Any], metadata: Dict[str, Any]) -> Dict[str, Any]:
     """
     Simulate video analysis results for development purposes.
     """
+    now = datetime.now(timezone.utc)
     return {
-        "analysis_id": f"analysis_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}",
+        "analysis_id": _ANALYSIS_ID_PREFIX + str(next(_analysis_counter)),
         "video_info": {
             "name": video_info.get('blob_name', 'sample_video.mp4'),
             "duration_seconds": metadata.get('video_properties', {}).get('duration_seconds', 120)
         },
-        "insights": {
-            "transcript": {
-                "language": "es-ES",
-                "confidence": 0.92,
-                "text": "Bienvenidos a este vídeo tutorial sobre Azure Functions y procesamiento de vídeo. En este contenido aprenderemos sobre las mejores prácticas para implementar soluciones escalables.",
-                "segments": [
-                    {
-                        "start_time": 0.0,
-                        "end_time": 5.2,
-                        "text": "Bienvenidos a este vídeo tutorial sobre Azure Functions",
-                        "confidence": 0.94
-                    },
-                    {
-                        "start_time": 5.2,
-                        "end_time": 12.8,
-                        "text": "y procesamiento de vídeo. En este contenido aprenderemos",
-                        "confidence": 0.91
-                    },
-                    {
-                        "start_time": 12.8,
-                        "end_time": 18.5,
-                        "text": "sobre las mejores prácticas para implementar soluciones escalables.",
-                        "confidence": 0.89
-                    }
-                ]
-            },
-            "keyframes": [
-                {
-                    "time": 0.0,
-                    "confidence": 0.95,
-                    "description": "Pantalla de título con logo de Azure"
-                },
-                {
-                    "time": 30.0,
-                    "confidence": 0.88,
-                    "description": "Diagrama de arquitectura de Azure Functions"
-                },
-                {
-                    "time": 60.0,
-                    "confidence": 0.92,
-                    "description": "Código fuente en VS Code"
-                }
-            ],
-            "labels": [
-                {"name": "azure", "confidence": 0.95, "count": 12},
-                {"name": "functions", "confidence": 0.92, "count": 8},
-                {"name": "cloud", "confidence": 0.89, "count": 6},
-                {"name": "desarrollo", "confidence": 0.87, "count": 5},
-                {"name": "tutorial", "confidence": 0.85, "count": 4}
-            ],
-            "faces": [
-                {
-                    "id": "face_1",
-                    "name": "Presenter",
-                    "confidence": 0.87,
-                    "appearances": [
-                        {"start": 10.0, "end": 45.0},
-                        {"start": 80.0, "end": 120.0}
-                    ]
-                }
-            ],
-            "emotions": [
-                {"name": "neutral", "confidence": 0.75, "avg_score": 0.65},
-                {"name": "happiness", "confidence": 0.20, "avg_score": 0.25},
-                {"name": "focused", "confidence": 0.82, "avg_score": 0.78}
-            ],
-            "topics": [
-                {"name": "Azure Functions", "confidence": 0.94, "relevance": 0.89},
-                {"name": "Cloud Computing", "confidence": 0.91, "relevance": 0.85},
-                {"name": "Video Processing", "confidence": 0.88, "relevance": 0.82},
-                {"name": "Software Development", "confidence": 0.85, "relevance": 0.78}
-            ],
-            "scenes": [
-                {
-                    "id": "scene_1",
-                    "start": 0.0,
-                    "end": 30.0,
-                    "description": "Introducción y presentación del tutorial"
-                },
-                {
-                    "id": "scene_2", 
-                    "start": 30.0,
-                    "end": 90.0,
-                    "description": "Explicación técnica de Azure Functions"
-                },
-                {
-                    "id": "scene_3",
-                    "start": 90.0,
-                    "end": 120.0,
-                    "description": "Demostración práctica y conclusiones"
-                }
-            ]
-        },
+        "insights": _SIMULATED_INSIGHTS,
         "processing_info": {
-            "analyzed_at": datetime.now(timezone.utc).isoformat(),
+            "analyzed_at": now.isoformat(),
             "analysis_duration_seconds": 15.3,
             "api_version": "2024-12-01-preview",
             "status": "completed"
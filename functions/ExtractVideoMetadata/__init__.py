@@ -1,10 +1,119 @@
 import logging
 import json
+from collections import OrderedDict
 from datetime import datetime, timezone
-import azure.functions as func
-from azure.storage.blob import BlobServiceClient
-import os
-from typing import Dict, Any
+from typing import TYPE_CHECKING, Dict, Any, Optional, Tuple
+from ..shared.utils.config import Config
+
+# The Storage SDK is imported lazily so the simulated (local development)
+# path doesn't pay for it on cold start
+if TYPE_CHECKING:
+    from azure.storage.blob.aio import BlobServiceClient, ContainerClient
+
+
+# Storage connection string is fixed for the lifetime of the worker
+_STORAGE_CONNECTION_STRING = Config.AZURE_STORAGE_CONNECTION_STRING
+
+# Constant video properties returned by the simulated extraction
+_SIMULATED_VIDEO_PROPERTIES = {
+    "duration_seconds": 120,  # 2 minutes default
+    "resolution": "1920x1080",
+    "frame_rate": 30,
+    "codec": "h264",
+    "bitrate": 2000
+}
+
+# Singleton pattern for client reuse
+_blob_service_client = None
+_container_clients: Dict[str, "ContainerClient"] = {}
+
+# Per-worker cache of blob file properties keyed by (container, blob)
+_BLOB_PROPERTIES_CACHE_SIZE = 1024
+_blob_properties_cache: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+
+
+def _get_blob_service() -> "BlobServiceClient":
+    """
+    Get singleton instance of the async Blob service client.
+    
+    Must be called from a running event loop: the aiohttp transport binds
+    to the loop it is first used on, which is the worker's loop.
+    """
+    global _blob_service_client
+    if _blob_service_client is None:
+        from azure.storage.blob.aio import BlobServiceClient
+        _blob_service_client = BlobServiceClient.from_connection_string(_STORAGE_CONNECTION_STRING)
+    return _blob_service_client
+
+
+def _get_container_client(container_name: str) -> "ContainerClient":
+    """Get a cached container client for the given container."""
+    container_client = _container_clients.get(container_name)
+    if container_client is None:
+        container_client = _get_blob_service().get_container_client(container_name)
+        _container_clients[container_name] = container_client
+    return container_client
+
+
+def _normalize_etag(etag: Optional[str]) -> str:
+    """Strip the quotes that some sources (e.g. Event Grid) omit from ETags."""
+    return (etag or "").strip('"')
+
+
+async def _get_blob_file_info(container_name: str, blob_name: str, event_etag: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Get the file properties of a blob, reusing the cached copy when unchanged.
+    
+    Cached entries are revalidated with a conditional request, so an unchanged
+    blob costs a 304 response without a body. An ETag from the triggering event
+    that differs from the cached one drops the entry before the request.
+    
+    Args:
+        container_name: Blob container name
+        blob_name: Blob name
+        event_etag: Current ETag reported by the triggering event, if any
+        
+    Returns:
+        Dictionary with the blob file properties
+    """
+    from azure.core import MatchConditions
+    from azure.core.exceptions import ResourceNotModifiedError
+    
+    key = (container_name, blob_name)
+    cached = _blob_properties_cache.get(key)
+    if cached is not None and event_etag and _normalize_etag(event_etag) != _normalize_etag(cached["etag"]):
+        del _blob_properties_cache[key]
+        cached = None
+    
+    blob_client = _get_container_client(container_name).get_blob_client(blob_name)
+    
+    if cached is not None:
+        try:
+            blob_properties = await blob_client.get_blob_properties(
+                etag=cached["etag"],
+                match_condition=MatchConditions.IfModified
+            )
+        except ResourceNotModifiedError:
+            _blob_properties_cache.move_to_end(key)
+            return cached
+    else:
+        blob_properties = await blob_client.get_blob_properties()
+    
+    file_info = {
+        "size_bytes": blob_properties.size,
+        "size_mb": round(blob_properties.size / (1024 * 1024), 2),
+        "content_type": blob_properties.content_settings.content_type,
+        "creation_time": blob_properties.creation_time.isoformat() if blob_properties.creation_time else None,
+        "last_modified": blob_properties.last_modified.isoformat() if blob_properties.last_modified else None,
+        "etag": blob_properties.etag,
+    }
+    
+    _blob_properties_cache[key] = file_info
+    _blob_properties_cache.move_to_end(key)
+    if len(_blob_properties_cache) > _BLOB_PROPERTIES_CACHE_SIZE:
+        _blob_properties_cache.popitem(last=False)
+    
+    return file_info
 
 
 async def main(video_info: Dict[str, Any]) -> Dict[str, Any]:
@@ -17,25 +126,15 @@ async def main(video_info: Dict[str, Any]) -> Dict[str, Any]:
     logging.info(f"Extracting metadata for video: {video_info.get('blob_name')}")
     
     try:
-        # Get blob service client
-        storage_connection_string = os.environ.get("AzureWebJobsStorage")
-        if not storage_connection_string or storage_connection_string == "UseDevelopmentStorage=true":
+        if not _STORAGE_CONNECTION_STRING or _STORAGE_CONNECTION_STRING == "UseDevelopmentStorage=true":
             # For local development, we'll simulate metadata extraction
             return simulate_metadata_extraction(video_info)
         
-        blob_service_client = BlobServiceClient.from_connection_string(storage_connection_string)
-        
-        # Get blob client
         container_name = video_info.get('container_name', 'videos')
         blob_name = video_info.get('blob_name')
         
-        blob_client = blob_service_client.get_blob_client(
-            container=container_name, 
-            blob=blob_name
-        )
-        
-        # Get blob properties
-        blob_properties = blob_client.get_blob_properties()
+        # Get blob properties (cached per worker, revalidated by ETag)
+        file_info = await _get_blob_file_info(container_name, blob_name, video_info.get('etag'))
         
         # Extract metadata
         metadata = {
@@ -43,12 +142,7 @@ async def main(video_info: Dict[str, Any]) -> Dict[str, Any]:
                 "blob_name": blob_name,
                 "container_name": container_name,
                 "blob_url": video_info.get('blob_url'),
-                "size_bytes": blob_properties.size,
-                "size_mb": round(blob_properties.size / (1024 * 1024), 2),
-                "content_type": blob_properties.content_settings.content_type,
-                "creation_time": blob_properties.creation_time.isoformat() if blob_properties.creation_time else None,
-                "last_modified": blob_properties.last_modified.isoformat() if blob_properties.last_modified else None,
-                "etag": blob_properties.etag,
+                **file_info
             },
             "processing_info": {
                 "extracted_at": datetime.now(timezone.utc).isoformat(),
@@ -77,6 +171,7 @@ def simulate_metadata_extraction(video_info: Dict[str, Any]) -> Dict[str, Any]:
     """
     Simulate metadata extraction for local development.
     """
+    now_iso = datetime.now(timezone.utc).isoformat()
     return {
         "file_info": {
             "blob_name": video_info.get('blob_name', 'sample_video.mp4'),
@@ -85,19 +180,13 @@ def simulate_metadata_extraction(video_info: Dict[str, Any]) -> Dict[str, Any]:
             "size_bytes": video_info.get('content_length', 10485760),  # 10MB default
             "size_mb": round(video_info.get('content_length', 10485760) / (1024 * 1024), 2),
             "content_type": video_info.get('content_type', 'video/mp4'),
-            "creation_time": datetime.now(timezone.utc).isoformat(),
-            "last_modified": datetime.now(timezone.utc).isoformat(),
+            "creation_time": now_iso,
+            "last_modified": now_iso,
             "etag": "mock-etag-12345",
         },
         "processing_info": {
-            "extracted_at": datetime.now(timezone.utc).isoformat(),
+            "extracted_at": now_iso,
             "extraction_status": "completed"
         },
-        "video_properties": {
-            "duration_seconds": 120,  # 2 minutes default
-            "resolution": "1920x1080",
-            "frame_rate": 30,
-            "codec": "h264",
-            "bitrate": 2000
-        }
+        "video_properties": _SIMULATED_VIDEO_PROPERTIES
     }
\ No newline at end of file
@@ -1,15 +1,18 @@
 import logging
 import json
-import os
 from datetime import datetime, timezone
+from types import MappingProxyType
 from typing import Dict, Any, List
-import azure.functions as func
-import asyncio
-import sys
+import numpy as np
+from ..shared.clients.openai_client import AzureOpenAIClient, get_openai_client
+from ..shared.utils.config import Config
+from ..shared.utils.vectors import quantize_int8
 
-# Add shared folder to path
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from shared.clients.openai_client import get_openai_client
+# Shared read-only default for missing nested sections
+_EMPTY = MappingProxyType({})
+
+# Random generator for simulated embeddings
+_RNG = np.random.default_rng()
 
 
 async def main(input_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -26,20 +29,20 @@ async def main(input_data: Dict[str, Any]) -> Dict[str, Any]:
     logging.info(f"Generating embeddings for video: {video_info.get('blob_name')}")
     
     try:
-        # Get Azure OpenAI client
-        openai_client = get_openai_client()
-        
         # Check if we have proper configuration
-        if not os.environ.get("AZURE_OPENAI_ENDPOINT"):
+        if not Config.AZURE_OPENAI_ENDPOINT:
             # For development, return simulated embeddings
             logging.info("No OpenAI endpoint configured, returning simulated embeddings")
             return simulate_embeddings_generation(video_info, analysis, metadata)
         
+        # Get Azure OpenAI client
+        openai_client = get_openai_client()
+        
         # Prepare text content for embedding
         text_content = prepare_text_for_embedding(analysis)
         
-        # Generate embeddings using official client
-        embeddings_result = await openai_client.generate_embeddings(text_content)
+        # Generate all embeddings with a single batched request
+        embeddings_result = await generate_openai_embeddings(openai_client, text_content)
         
         logging.info(f"Successfully generated embeddings for: {video_info.get('blob_name')}")
         return embeddings_result
@@ -53,27 +56,24 @@ def prepare_text_for_embedding(analysis: Dict[str, Any]) -> Dict[str, str]:
     """
     Prepare different types of text content from the video analysis for embedding.
     """
-    insights = analysis.get('insights', {})
+    # Sections may be missing or null (e.g. no transcript); both fall back
+    # to shared empty defaults instead of allocating new ones
+    insights = analysis.get('insights') or _EMPTY
     
     # Combine transcript text
-    transcript = insights.get('transcript', {})
-    full_transcript = transcript.get('text', '')
+    full_transcript = (insights.get('transcript') or _EMPTY).get('text') or ''
     
     # Combine topics
-    topics = insights.get('topics', [])
-    topics_text = ' '.join([topic.get('name', '') for topic in topics])
+    topics_text = ' '.join([topic.get('name', '') for topic in insights.get('topics') or ()])
     
     # Combine labels/tags
-    labels = insights.get('labels', [])
-    labels_text = ' '.join([label.get('name', '') for label in labels])
+    labels_text = ' '.join([label.get('name', '') for label in insights.get('labels') or ()])
     
     # Combine scene descriptions
-    scenes = insights.get('scenes', [])
-    scenes_text = ' '.join([scene.get('description', '') for scene in scenes])
+    scenes_text = ' '.join([scene.get('description', '') for scene in insights.get('scenes') or ()])
     
     # Combine keyframe descriptions
-    keyframes = insights.get('keyframes', [])
-    keyframes_text = ' '.join([kf.get('description', '') for kf in keyframes])
+    keyframes_text = ' '.join([kf.get('description', '') for kf in insights.get('keyframes') or ()])
     
     return {
         "full_transcript": full_transcript,
@@ -81,70 +81,69 @@ def prepare_text_for_embedding(analysis: Dict[str, Any]) -> Dict[str, str]:
         "labels": labels_text,
         "scenes": scenes_text,
         "keyframes": keyframes_text,
-        "combined_content": f"{full_transcript} {topics_text} {labels_text} {scenes_text} {keyframes_text}".strip()
+        # Single pass over the non-empty parts; no intermediate f-string copy
+        "combined_content": " ".join(
+            part for part in (full_transcript, topics_text, labels_text, scenes_text, keyframes_text) if part
+        )
     }
 
 
-async def generate_openai_embeddings(endpoint: str, deployment: str, text_content: Dict[str, str]) -> Dict[str, Any]:
+async def generate_openai_embeddings(openai_client: AzureOpenAIClient, text_content: Dict[str, str]) -> Dict[str, Any]:
     """
-    Generate embeddings using Azure OpenAI API.
+    Generate embeddings for every text field using Azure OpenAI.
+    
+    All fields are embedded with one multi-input request instead of one
+    request per field. Identical texts are only sent once and their vector
+    is shared by every field that produced them. Empty texts are not sent
+    at all and get a zero vector.
     """
-    # This is a placeholder for the actual Azure OpenAI API call
-    # In a real implementation, you would:
-    # 1. Use the Azure OpenAI Python SDK
-    # 2. Call the embeddings endpoint for each text content
-    # 3. Return the vector embeddings
+    keys, texts = zip(*text_content.items())
+    unique_texts = [text for text in dict.fromkeys(texts) if text]
+    
+    vectors = await openai_client.generate_embeddings(unique_texts) if unique_texts else ()
     
-    # For now, simulate the API call
-    await asyncio.sleep(1)  # Simulate processing time
+    # Vectors are int8-quantized to keep activity payloads small
+    model = openai_client.embedding_deployment
+    encoded_by_text = {
+        text: {**quantize_int8(vector), "model": model}
+        for text, vector in zip(unique_texts, vectors)
+    }
+    dimension = vectors.shape[1] if len(vectors) else Config.AZURE_OPENAI_EMBEDDING_DIMENSION
+    encoded_by_text[''] = {**quantize_int8(np.zeros(dimension, dtype=np.float32)), "model": model}
+    
+    embeddings = {key: encoded_by_text[text] for key, text in zip(keys, texts)}
     
-    return simulate_embeddings_generation({}, {}, {})
+    return {
+        "embeddings": embeddings,
+        "text_content": text_content,
+        "processing_info": {
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "embedding_model": model,
+            "total_embeddings": len(embeddings),
+            "unique_inputs": len(unique_texts),
+            "status": "completed"
+        }
+    }
 
 
 def simulate_embeddings_generation(video_info: Dict[str, Any], analysis: Dict[str, Any], metadata: Dict[str, Any]) -> Dict[str, Any]:
     """
     Simulate embeddings generation for development purposes.
     """
-    import random
-    
     # Simulate 1536-dimensional embeddings (text-embedding-ada-002 standard)
     embedding_dimension = 1536
+    embedding_keys = ("full_transcript", "topics", "labels", "scenes", "keyframes", "combined_content")
     
-    def generate_mock_embedding() -> List[float]:
-        return [random.uniform(-1, 1) for _ in range(embedding_dimension)]
+    # Generate every mock vector with a single vectorized call, drawing
+    # float32 directly and rescaling [0, 1) to [-1, 1) in place
+    vectors = _RNG.random((len(embedding_keys), embedding_dimension), dtype=np.float32)
+    vectors *= 2
+    vectors -= 1
     
     return {
         "embeddings": {
-            "full_transcript": {
-                "vector": generate_mock_embedding(),
-                "dimension": embedding_dimension,
-                "model": "text-embedding-ada-002"
-            },
-            "topics": {
-                "vector": generate_mock_embedding(),
-                "dimension": embedding_dimension,
-                "model": "text-embedding-ada-002"
-            },
-            "labels": {
-                "vector": generate_mock_embedding(),
-                "dimension": embedding_dimension,
-                "model": "text-embedding-ada-002"
-            },
-            "scenes": {
-                "vector": generate_mock_embedding(),
-                "dimension": embedding_dimension,
-                "model": "text-embedding-ada-002"
-            },
-            "keyframes": {
-                "vector": generate_mock_embedding(),
-                "dimension": embedding_dimension,
-                "model": "text-embedding-ada-002"
-            },
-            "combined_content": {
-                "vector": generate_mock_embedding(),
-                "dimension": embedding_dimension,
-                "model": "text-embedding-ada-002"
-            }
+            key: {**quantize_int8(vector), "model": "text-embedding-ada-002"}
+            for key, vector in zip(embedding_keys, vectors)
         },
         "text_content": {
             "full_transcript": "Bienvenidos a este vídeo tutorial sobre Azure Functions...",
@@ -157,7 +156,7 @@ def simulate_embeddings_generation(video_info: Dict[str, Any], analysis: Dict[st
         "processing_info": {
             "generated_at": datetime.now(timezone.utc).isoformat(),
             "embedding_model": "text-embedding-ada-002",
-            "total_embeddings": 6,
+            "total_embeddings": len(embedding_keys),
             "dimension": embedding_dimension,
             "status": "completed"
         }
@@ -1,15 +1,107 @@
 import logging
 import json
-import os
 from datetime import datetime, timezone
+from itertools import islice
+from types import MappingProxyType
 from typing import Dict, Any, List
-import azure.functions as func
 import asyncio
-import sys
+from ..shared.clients.openai_client import get_openai_client
+from ..shared.utils.config import Config
 
-# Add shared folder to path
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from shared.clients.openai_client import get_openai_client
+
+# Shared read-only default for missing nested sections
+_EMPTY = MappingProxyType({})
+
+# Constant part of the simulated insights, shared by every call.
+# Lists are tuples so the shared template cannot be mutated by accident.
+_SIMULATED_VIDEO_INSIGHTS = {
+    "summary": {
+        "title": "Tutorial de Azure Functions y Procesamiento de Vídeo",
+        "short_description": "Un tutorial completo sobre cómo implementar soluciones de procesamiento de vídeo usando Azure Functions y servicios de IA.",
+        "key_points": (
+            "Introducción a Azure Functions para procesamiento asíncrono",
+            "Integración con Azure AI Video Indexer para análisis automático",
+            "Implementación de arquitectura serverless escalable",
+            "Mejores prácticas para manejo de archivos multimedia en la nube"
+        ),
+        "target_audience": "Desarrolladores interesados en soluciones cloud y procesamiento multimedia",
+        "complexity_level": "Intermedio",
+        "estimated_learning_time_minutes": 25
+    },
+    "content_analysis": {
+        "primary_topics": (
+            {"topic": "Azure Functions", "relevance": 0.95, "coverage_percentage": 65},
+            {"topic": "Video Processing", "relevance": 0.90, "coverage_percentage": 45},
+            {"topic": "Cloud Architecture", "relevance": 0.85, "coverage_percentage": 35},
+            {"topic": "AI Services", "relevance": 0.80, "coverage_percentage": 30}
+        ),
+        "content_type": "Educational/Tutorial",
+        "presentation_style": "Technical demonstration with code examples",
+        "visual_elements": (
+            "Architecture diagrams",
+            "Code snippets in VS Code", 
+            "Azure portal interface",
+            "Live coding sessions"
+        )
+    },
+    "engagement_metrics": {
+        "estimated_engagement_score": 0.82,
+        "content_density": "High",
+        "pace": "Moderate",
+        "technical_depth": "Detailed with practical examples",
+        "accessibility": {
+            "language_clarity": 0.88,
+            "visual_support": 0.85,
+            "code_readability": 0.90
+        }
+    },
+    "actionable_insights": {
+        "recommended_tags": (
+            "azure-functions", "video-processing", "serverless", 
+            "ai-video-indexer", "cloud-architecture", "tutorial"
+        ),
+        "suggested_follow_up_content": (
+            "Advanced Azure Functions patterns",
+            "Performance optimization for video processing",
+            "Cost management in serverless video solutions",
+            "Integration with other Azure AI services"
+        ),
+        "learning_objectives": (
+            "Understand Azure Functions architecture",
+            "Implement video processing workflows", 
+            "Configure AI service integrations",
+            "Deploy scalable multimedia solutions"
+        )
+    },
+    "technical_metadata": {
+        "complexity_indicators": {
+            "code_complexity": "Intermediate",
+            "architecture_complexity": "Advanced",
+            "deployment_complexity": "Intermediate"
+        },
+        "prerequisites": (
+            "Basic Azure knowledge",
+            "Python programming experience",
+            "Understanding of cloud concepts",
+            "Familiarity with REST APIs"
+        ),
+        "technologies_covered": (
+            "Azure Functions", "Azure AI Video Indexer", 
+            "Azure Blob Storage", "Azure Cognitive Search",
+            "Python", "JSON", "REST APIs"
+        )
+    },
+    "search_optimization": {
+        "optimized_title": "Azure Functions Video Processing: Complete Tutorial with AI Analysis",
+        "meta_description": "Learn to build scalable video processing solutions using Azure Functions, AI Video Indexer, and serverless architecture. Includes code examples and best practices.",
+        "search_keywords": (
+            "azure functions tutorial", "video processing cloud", 
+            "ai video analysis", "serverless multimedia", 
+            "azure video indexer", "python azure functions"
+        ),
+        "content_categories": ("Tutorial", "Azure", "Video Processing", "AI", "Serverless")
+    }
+}
 
 
 async def main(input_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -27,15 +119,15 @@ async def main(input_data: Dict[str, Any]) -> Dict[str, Any]:
     logging.info(f"Generating final insights for video: {video_info.get('blob_name')}")
     
     try:
-        # Get Azure OpenAI client
-        openai_client = get_openai_client()
-        
         # Check if we have proper configuration
-        if not os.environ.get("AZURE_OPENAI_ENDPOINT"):
+        if not Config.AZURE_OPENAI_ENDPOINT:
             # For development, return simulated insights
             logging.info("No OpenAI chat endpoint configured, returning simulated insights")
             return simulate_insights_generation(video_info, metadata, analysis, search_document_id)
         
+        # Get Azure OpenAI client
+        openai_client = get_openai_client()
+        
         # Prepare context for insights generation
         insights_context = prepare_insights_context(video_info, metadata, analysis)
         
@@ -60,19 +152,24 @@ def prepare_insights_context(video_info: Dict[str, Any], metadata: Dict[str, Any
     """
     Prepare context information for AI insights generation.
     """
-    insights = analysis.get('insights', {})
+    # Sections may be missing or null (e.g. no transcript); both fall back
+    # to shared empty defaults instead of allocating new ones
+    insights = analysis.get('insights') or _EMPTY
+    transcript = insights.get('transcript') or _EMPTY
+    duration_seconds = (metadata.get('video_properties') or _EMPTY).get('duration_seconds') or 0
+    file_size_mb = (metadata.get('file_info') or _EMPTY).get('size_mb') or 0
     
     return {
         "video_name": video_info.get('blob_name', ''),
-        "duration_minutes": round(metadata.get('video_properties', {}).get('duration_seconds', 0) / 60, 1),
-        "file_size_mb": metadata.get('file_info', {}).get('size_mb', 0),
-        "transcript": insights.get('transcript', {}).get('text', ''),
-        "topics": [topic.get('name', '') for topic in insights.get('topics', [])[:10]],  # Top 10 topics
-        "labels": [label.get('name', '') for label in insights.get('labels', [])[:15]],  # Top 15 labels
-        "scenes_count": len(insights.get('scenes', [])),
-        "faces_detected": len(insights.get('faces', [])),
-        "keyframes_count": len(insights.get('keyframes', [])),
-        "language": insights.get('transcript', {}).get('language', 'Unknown')
+        "duration_minutes": round(duration_seconds / 60, 1),
+        "file_size_mb": file_size_mb,
+        "transcript": transcript.get('text', ''),
+        "topics": [topic['name'] for topic in islice(insights.get('topics') or (), 10) if 'name' in topic],  # Top 10 topics
+        "labels": [label['name'] for label in islice(insights.get('labels') or (), 15) if 'name' in label],  # Top 15 labels
+        "scenes_count": len(insights.get('scenes') or ()),
+        "faces_detected": len(insights.get('faces') or ()),
+        "keyframes_count": len(insights.get('keyframes') or ()),
+        "language": transcript.get('language', 'Unknown')
     }
 
 
@@ -102,92 +199,7 @@ def simulate_insights_generation(
     Simulate AI insights generation for development purposes.
     """
     return {
-        "summary": {
-            "title": "Tutorial de Azure Functions y Procesamiento de Vídeo",
-            "short_description": "Un tutorial completo sobre cómo implementar soluciones de procesamiento de vídeo usando Azure Functions y servicios de IA.",
-            "key_points": [
-                "Introducción a Azure Functions para procesamiento asíncrono",
-                "Integración con Azure AI Video Indexer para análisis automático",
-                "Implementación de arquitectura serverless escalable",
-                "Mejores prácticas para manejo de archivos multimedia en la nube"
-            ],
-            "target_audience": "Desarrolladores interesados en soluciones cloud y procesamiento multimedia",
-            "complexity_level": "Intermedio",
-            "estimated_learning_time_minutes": 25
-        },
-        "content_analysis": {
-            "primary_topics": [
-                {"topic": "Azure Functions", "relevance": 0.95, "coverage_percentage": 65},
-                {"topic": "Video Processing", "relevance": 0.90, "coverage_percentage": 45},
-                {"topic": "Cloud Architecture", "relevance": 0.85, "coverage_percentage": 35},
-                {"topic": "AI Services", "relevance": 0.80, "coverage_percentage": 30}
-            ],
-            "content_type": "Educational/Tutorial",
-            "presentation_style": "Technical demonstration with code examples",
-            "visual_elements": [
-                "Architecture diagrams",
-                "Code snippets in VS Code", 
-                "Azure portal interface",
-                "Live coding sessions"
-            ]
-        },
-        "engagement_metrics": {
-            "estimated_engagement_score": 0.82,
-            "content_density": "High",
-            "pace": "Moderate",
-            "technical_depth": "Detailed with practical examples",
-            "accessibility": {
-                "language_clarity": 0.88,
-                "visual_support": 0.85,
-                "code_readability": 0.90
-            }
-        },
-        "actionable_insights": {
-            "recommended_tags": [
-                "azure-functions", "video-processing", "serverless", 
-                "ai-video-indexer", "cloud-architecture", "tutorial"
-            ],
-            "suggested_follow_up_content": [
-                "Advanced Azure Functions patterns",
-                "Performance optimization for video processing",
-                "Cost management in serverless video solutions",
-                "Integration with other Azure AI services"
-            ],
-            "learning_objectives": [
-                "Understand Azure Functions architecture",
-                "Implement video processing workflows", 
-                "Configure AI service integrations",
-                "Deploy scalable multimedia solutions"
-            ]
-        },
-        "technical_metadata": {
-            "complexity_indicators": {
-                "code_complexity": "Intermediate",
-                "architecture_complexity": "Advanced",
-                "deployment_complexity": "Intermediate"
-            },
-            "prerequisites": [
-                "Basic Azure knowledge",
-                "Python programming experience",
-                "Understanding of cloud concepts",
-                "Familiarity with REST APIs"
-            ],
-            "technologies_covered": [
-                "Azure Functions", "Azure AI Video Indexer", 
-                "Azure Blob Storage", "Azure Cognitive Search",
-                "Python", "JSON", "REST APIs"
-            ]
-        },
-        "search_optimization": {
-            "optimized_title": "Azure Functions Video Processing: Complete Tutorial with AI Analysis",
-            "meta_description": "Learn to build scalable video processing solutions using Azure Functions, AI Video Indexer, and serverless architecture. Includes code examples and best practices.",
-            "search_keywords": [
-                "azure functions tutorial", "video processing cloud", 
-                "ai video analysis", "serverless multimedia", 
-                "azure video indexer", "python azure functions"
-            ],
-            "content_categories": ["Tutorial", "Azure", "Video Processing", "AI", "Serverless"]
-        },
+        **_SIMULATED_VIDEO_INSIGHTS,
         "processing_info": {
             "generated_at": datetime.now(timezone.utc).isoformat(),
             "ai_model": "gpt-4",
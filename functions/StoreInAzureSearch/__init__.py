@@ -1,24 +1,34 @@
+import base64
+import hashlib
 import logging
 import json
-import os
 from datetime import datetime, timezone
-from typing import Dict, Any, List
-import azure.functions as func
-import asyncio
-import sys
+from typing import Dict, Any, List, Union
+import numpy as np
+from ..shared.clients.search_client import get_search_client
+from ..shared.utils.config import Config
+from ..shared.utils.vectors import dequantize_int8, int8_values, quantize_int8
 
-# Add shared folder to path
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from shared.clients.search_client import get_search_client
+# Index vectors as int8 (Collection(Edm.SByte)) instead of float32
+_INT8_VECTORS = Config.AZURE_SEARCH_VECTOR_FORMAT == "int8"
 
+# The Search endpoint is fixed for the lifetime of the worker
+_HAS_SEARCH = bool(Config.AZURE_SEARCH_ENDPOINT)
 
-async def main(input_data: Dict[str, Any]) -> Dict[str, Any]:
+
+async def main(input_data: Union[Dict[str, Any], List[Dict[str, Any]]]) -> Dict[str, Any]:
     """
     Store video analysis results and embeddings in Azure Cognitive Search.
     
     This activity function creates or updates a search document with all the
     video metadata, analysis results, and vector embeddings for semantic search.
+    
+    The input is either one video's results or a list of them; a list is
+    uploaded with a single batched indexing request.
     """
+    if isinstance(input_data, list):
+        return await store_batch(input_data)
+    
     video_info = input_data.get('video_info', {})
     metadata = input_data.get('metadata', {})
     analysis = input_data.get('analysis', {})
@@ -27,20 +37,20 @@ async def main(input_data: Dict[str, Any]) -> Dict[str, Any]:
     logging.info(f"Storing search document for video: {video_info.get('blob_name')}")
     
     try:
-        # Get Azure Search client
-        search_client = get_search_client()
-        
         # Check if we have proper configuration
-        if not os.environ.get("AZURE_SEARCH_ENDPOINT"):
+        if not _HAS_SEARCH:
             # For development, return simulated storage result
             logging.info("No Search endpoint configured, returning simulated storage result")
             return simulate_search_storage(video_info, metadata, analysis, embeddings)
         
+        # Get Azure Search client
+        search_client = get_search_client()
+        
         # Prepare search document
         search_document = prepare_search_document(video_info, metadata, analysis, embeddings)
         
         # Store document using official client
-        storage_result = search_client.upload_document(search_document)
+        storage_result = await search_client.upload_document(search_document)
         
         logging.info(f"Successfully stored search document for: {video_info.get('blob_name')}")
         return {
@@ -54,6 +64,66 @@ async def main(input_data: Dict[str, Any]) -> Dict[str, Any]:
         raise Exception(f"Search storage failed: {str(e)}")
 
 
+async def store_batch(items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Store the results of several videos with one batched upload.
+    
+    Every item has the same shape as the single-video input. The documents
+    are sent in one `upload_documents` call, so the batch costs a single
+    HTTPS round-trip to the Search service instead of one per video.
+    """
+    logging.info(f"Storing {len(items)} search documents in one batch")
+    
+    try:
+        # Check if we have proper configuration
+        if not _HAS_SEARCH:
+            logging.info("No Search endpoint configured, returning simulated storage result")
+            results = [
+                simulate_search_storage(
+                    item.get('video_info', {}),
+                    item.get('metadata', {}),
+                    item.get('analysis', {}),
+                    item.get('embeddings', {})
+                )
+                for item in items
+            ]
+            return {
+                "document_ids": [result["document_id"] for result in results],
+                "status": "success",
+                "upload_result": {
+                    "successful_count": len(results),
+                    "failed_count": 0,
+                    "failed_documents": [],
+                    "status": "completed"
+                }
+            }
+        
+        search_client = get_search_client()
+        
+        documents = [
+            prepare_search_document(
+                item.get('video_info', {}),
+                item.get('metadata', {}),
+                item.get('analysis', {}),
+                item.get('embeddings', {})
+            )
+            for item in items
+        ]
+        
+        storage_result = await search_client.upload_documents(documents)
+        
+        logging.info(f"Successfully stored {len(documents)} search documents")
+        return {
+            "document_ids": [document["id"] for document in documents],
+            "status": "success",
+            "upload_result": storage_result
+        }
+        
+    except Exception as e:
+        logging.error(f"Error storing search document batch: {str(e)}")
+        raise Exception(f"Search storage failed: {str(e)}")
+
+
 def prepare_search_document(
     video_info: Dict[str, Any], 
     metadata: Dict[str, Any], 
@@ -63,13 +133,24 @@ def prepare_search_document(
     """
     Prepare the document structure for Azure Cognitive Search.
     """
+    # One clock read for every timestamp in the document
+    now = datetime.now(timezone.utc)
+    now_iso = now.isoformat()
+    
     # Generate unique document ID
-    document_id = f"video_{video_info.get('blob_name', '').replace('.', '_').replace(' ', '_')}_{int(datetime.now(timezone.utc).timestamp())}"
+    document_id = make_document_id(video_info.get('blob_name', ''), int(now.timestamp()))
+    
+    # Extract key information; each nested section is looked up once
+    file_info = metadata.get('file_info') or {}
+    video_properties = metadata.get('video_properties') or {}
+    insights = analysis.get('insights') or {}
+    transcript = insights.get('transcript') or {}
+    transcript_text = transcript.get('text', '')
+    faces = insights.get('faces') or ()
     
-    # Extract key information
-    file_info = metadata.get('file_info', {})
-    insights = analysis.get('insights', {})
-    transcript = insights.get('transcript', {})
+    # Shared by the facet fields and the searchable text
+    topic_names = [topic.get('name', '') for topic in insights.get('topics') or ()]
+    label_names = [label.get('name', '') for label in insights.get('labels') or ()]
     
     # Prepare the search document
     document = {
@@ -79,22 +160,22 @@ def prepare_search_document(
         "blob_url": video_info.get('blob_url', ''),
         "file_size_mb": file_info.get('size_mb', 0),
         "content_type": file_info.get('content_type', ''),
-        "upload_time": file_info.get('creation_time', datetime.now(timezone.utc).isoformat()),
-        "last_modified": file_info.get('last_modified', datetime.now(timezone.utc).isoformat()),
+        "upload_time": file_info.get('creation_time', now_iso),
+        "last_modified": file_info.get('last_modified', now_iso),
         
         # Video properties
-        "duration_seconds": metadata.get('video_properties', {}).get('duration_seconds', 0),
-        "resolution": metadata.get('video_properties', {}).get('resolution', ''),
-        "frame_rate": metadata.get('video_properties', {}).get('frame_rate', 0),
+        "duration_seconds": video_properties.get('duration_seconds', 0),
+        "resolution": video_properties.get('resolution', ''),
+        "frame_rate": video_properties.get('frame_rate', 0),
         
         # Transcript and language
-        "transcript": transcript.get('text', ''),
+        "transcript": transcript_text,
         "language": transcript.get('language', ''),
         "transcript_confidence": transcript.get('confidence', 0),
         
         # Topics and labels for faceted search
-        "topics": [topic.get('name', '') for topic in insights.get('topics', [])],
-        "labels": [label.get('name', '') for label in insights.get('labels', [])],
+        "topics": topic_names,
+        "labels": label_names,
         
         # Scene information
         "scenes": [
@@ -103,7 +184,7 @@ def prepare_search_document(
                 "start_time": scene.get('start', 0),
                 "end_time": scene.get('end', 0)
             }
-            for scene in insights.get('scenes', [])
+            for scene in insights.get('scenes') or ()
         ],
         
         # Keyframes for visual search
@@ -113,50 +194,99 @@ def prepare_search_document(
                 "description": kf.get('description', ''),
                 "confidence": kf.get('confidence', 0)
             }
-            for kf in insights.get('keyframes', [])
+            for kf in insights.get('keyframes') or ()
         ],
         
         # Faces detected
-        "faces_detected": len(insights.get('faces', [])),
-        "face_names": [face.get('name', '') for face in insights.get('faces', [])],
+        "faces_detected": len(faces),
+        "face_names": [face.get('name', '') for face in faces],
         
         # Processing metadata
-        "processed_at": datetime.now(timezone.utc).isoformat(),
+        "processed_at": now_iso,
         "analysis_id": analysis.get('analysis_id', ''),
-        "processing_version": "1.0",
+        "processing_version": "1.0-int8" if _INT8_VECTORS else "1.0",
         
         # Vector embeddings for semantic search
-        "transcript_vector": embeddings.get('embeddings', {}).get('combined_content', {}).get('vector', []),
-        "topics_vector": embeddings.get('embeddings', {}).get('topics', {}).get('vector', []),
-        "scenes_vector": embeddings.get('embeddings', {}).get('scenes', {}).get('vector', []),
+        "transcript_vector": get_embedding_vector(embeddings, 'combined_content'),
+        "topics_vector": get_embedding_vector(embeddings, 'topics'),
+        "scenes_vector": get_embedding_vector(embeddings, 'scenes'),
         
-        # Searchable combined text
-        "searchable_content": f"{transcript.get('text', '')} {' '.join([topic.get('name', '') for topic in insights.get('topics', [])])} {' '.join([label.get('name', '') for label in insights.get('labels', [])])}".strip()
+        # Topic and label terms not already covered by the transcript field
+        "searchable_content": extra_search_terms(transcript_text, topic_names + label_names)
     }
     
+    if _INT8_VECTORS:
+        # Scales let clients recover the float vectors; cosine ranking
+        # in the index does not need them
+        document["transcript_vector_scale"] = get_embedding_scale(embeddings, 'combined_content')
+        document["topics_vector_scale"] = get_embedding_scale(embeddings, 'topics')
+        document["scenes_vector_scale"] = get_embedding_scale(embeddings, 'scenes')
+    
     return document
 
 
-async def store_in_azure_search(endpoint: str, index_name: str, document: Dict[str, Any]) -> Dict[str, Any]:
+def extra_search_terms(transcript_text: str, names: List[str]) -> str:
     """
-    Store the document in Azure Cognitive Search.
+    Get the unique words of the topic/label names missing from the transcript.
+    
+    The transcript is indexed in its own field, so repeating it in
+    `searchable_content` only duplicates payload. Words are compared
+    case-insensitively and kept in first-seen order.
+    """
+    seen = set(transcript_text.lower().split())
+    terms = []
+    for name in names:
+        for word in name.split():
+            key = word.lower()
+            if key not in seen:
+                seen.add(key)
+                terms.append(word)
+    return ' '.join(terms)
+
+
+def make_document_id(blob_name: str, timestamp: int) -> str:
     """
-    # This is a placeholder for the actual Azure Search API call
-    # In a real implementation, you would:
-    # 1. Use the Azure Search Python SDK
-    # 2. Upload or merge the document into the search index
-    # 3. Handle any indexing errors
+    Build a fixed-length search document key for a processed video.
     
-    # For now, simulate the API call
-    await asyncio.sleep(1)  # Simulate processing time
+    The key is a 128-bit BLAKE2b hash of the blob name and processing time,
+    base32-encoded so it is valid as a Search key and safe in URLs.
+    """
+    digest = hashlib.blake2b(f"{blob_name}|{timestamp}".encode(), digest_size=16).digest()
+    return "v_" + base64.b32encode(digest).decode("ascii").rstrip("=").lower()
+
+
+def get_embedding(embeddings: Dict[str, Any], name: str) -> Dict[str, Any]:
+    """
+    Get an int8-quantized embedding from the GenerateEmbeddings output.
     
-    return {
-        "document_id": document.get('id'),
-        "index_name": index_name,
-        "operation": "upload",
-        "status": "succeeded",
-        "timestamp": datetime.now(timezone.utc).isoformat()
-    }
+    Plain `vector` lists are still accepted for results produced before
+    quantization was introduced, and are quantized here.
+    """
+    embedding = embeddings.get('embeddings', {}).get(name, {})
+    if 'vector_q8' not in embedding and embedding.get('vector'):
+        embedding = quantize_int8(embedding['vector'])
+    return embedding
+
+
+def get_embedding_vector(embeddings: Dict[str, Any], name: str) -> np.ndarray:
+    """
+    Get the vector to index from the GenerateEmbeddings output.
+    
+    Returns the raw int8 values when the index stores int8 vectors and the
+    dequantized float32 values otherwise. Vectors stay NumPy arrays until
+    the search client serializes the document.
+    """
+    embedding = get_embedding(embeddings, name)
+    if 'vector_q8' not in embedding:
+        return np.zeros(0, dtype=np.int8 if _INT8_VECTORS else np.float32)
+    if _INT8_VECTORS:
+        return int8_values(embedding)
+    return dequantize_int8(embedding)
+
+
+def get_embedding_scale(embeddings: Dict[str, Any], name: str) -> float:
+    """Get the int8 quantization scale of an embedding (1.0 if missing)."""
+    return get_embedding(embeddings, name).get('scale', 1.0)
 
 
 def simulate_search_storage(
@@ -168,14 +298,15 @@ def simulate_search_storage(
     """
     Simulate Azure Search storage for development purposes.
     """
-    document_id = f"video_{video_info.get('blob_name', 'sample').replace('.', '_')}_{int(datetime.now(timezone.utc).timestamp())}"
+    now = datetime.now(timezone.utc)
+    document_id = make_document_id(video_info.get('blob_name', 'sample'), int(now.timestamp()))
     
     return {
         "document_id": document_id,
         "index_name": "videos",
         "operation": "upload",
         "status": "succeeded",
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": now.isoformat(),
         "document_size_kb": 25.6,
         "indexing_duration_ms": 450,
         "search_url": f"https://example-search.search.windows.net/indexes/videos/docs/{document_id}"
@@ -1,6 +1,5 @@
 import logging
 import json
-from datetime import datetime, timedelta
 import azure.functions as func
 import azure.durable_functions as df
 from typing import Dict, Any, List
@@ -12,71 +11,82 @@ def orchestrator_function(context: df.DurableOrchestrationContext) -> Dict[str,
     
     This function coordinates all the steps needed to process a video:
     1. Extract video metadata and basic information
-    2. Analyze video content using Azure AI Video Indexer
+    2. Analyze video content using Azure AI Video Indexer (in parallel with step 1)
     3. Generate embeddings for search
     4. Store results in Azure Cognitive Search
-    5. Update processing status
+    5. Generate final insights (in parallel with step 3)
     """
     
     # Get the input video information
     video_info = context.get_input()
     logging.info(f"Starting orchestration for video: {video_info.get('blob_name')}")
     
+    # Kept as a datetime for the duration; only the output holds the ISO string
+    start_time = context.current_utc_datetime
+    
     # Initialize result tracking
     orchestration_result = {
         "video_info": video_info,
-        "start_time": context.current_utc_datetime.isoformat(),
+        "start_time": start_time.isoformat(),
         "status": "processing",
         "steps": {},
         "errors": []
     }
     
     try:
-        # Step 1: Extract Video Metadata
-        logging.info("Step 1: Extracting video metadata...")
-        metadata_result = yield context.call_activity(
-            "ExtractVideoMetadata", 
-            video_info
-        )
+        # Steps 1-2: Extract Video Metadata and Analyze Video Content with Azure AI.
+        # AnalyzeVideoContent only sends the blob URL to the service, and the
+        # simulated analysis has a fixed duration, so both run in parallel.
+        logging.info("Steps 1-2: Extracting video metadata and analyzing video content...")
+        metadata_result, analysis_result = yield context.task_all([
+            context.call_activity("ExtractVideoMetadata", video_info),
+            context.call_activity("AnalyzeVideoContent", {"video_info": video_info})
+        ])
         orchestration_result["steps"]["metadata"] = {
             "status": "completed",
             "result": metadata_result,
             "timestamp": context.current_utc_datetime.isoformat()
         }
-        
-        # Step 2: Analyze Video Content with Azure AI
-        logging.info("Step 2: Analyzing video content with Azure AI...")
-        analysis_result = yield context.call_activity(
-            "AnalyzeVideoContent", 
-            {
-                "video_info": video_info,
-                "metadata": metadata_result
-            }
-        )
         orchestration_result["steps"]["analysis"] = {
             "status": "completed", 
             "result": analysis_result,
             "timestamp": context.current_utc_datetime.isoformat()
         }
         
-        # Step 3: Generate Embeddings for Search
-        logging.info("Step 3: Generating embeddings...")
-        embeddings_result = yield context.call_activity(
-            "GenerateEmbeddings",
-            {
-                "video_info": video_info,
-                "analysis": analysis_result,
-                "metadata": metadata_result
-            }
-        )
+        # Steps 3 and 5: Generate Embeddings and Video Insights.
+        # Insights only need the metadata and analysis, so both run in parallel;
+        # the search document ID is attached to the insights once stored.
+        logging.info("Steps 3 and 5: Generating embeddings and final insights...")
+        context.set_custom_status({"stage": "embeddings_and_insights", "completed_steps": ["metadata", "analysis"]})
+        embeddings_result, insights_result = yield context.task_all([
+            context.call_activity(
+                "GenerateEmbeddings",
+                {
+                    "video_info": video_info,
+                    "analysis": analysis_result,
+                    "metadata": metadata_result
+                }
+            ),
+            context.call_activity(
+                "GenerateVideoInsights",
+                {
+                    "video_info": video_info,
+                    "metadata": metadata_result,
+                    "analysis": analysis_result
+                }
+            )
+        ])
+        # The vectors are only needed by StoreInAzureSearch; keeping them out
+        # of the orchestration output avoids serializing them a second time
         orchestration_result["steps"]["embeddings"] = {
             "status": "completed",
-            "result": embeddings_result,
+            "result": {"processing_info": embeddings_result.get("processing_info", {})},
             "timestamp": context.current_utc_datetime.isoformat()
         }
         
         # Step 4: Store in Azure Cognitive Search
         logging.info("Step 4: Storing in Azure Search...")
+        context.set_custom_status({"stage": "search_storage", "completed_steps": ["metadata", "analysis", "embeddings", "insights"]})
         search_result = yield context.call_activity(
             "StoreInAzureSearch",
             {
@@ -92,17 +102,14 @@ def orchestrator_function(context: df.DurableOrchestrationContext) -> Dict[str,
             "timestamp": context.current_utc_datetime.isoformat()
         }
         
-        # Step 5: Generate Final Summary and Insights
-        logging.info("Step 5: Generating final insights...")
-        insights_result = yield context.call_activity(
-            "GenerateVideoInsights",
-            {
-                "video_info": video_info,
-                "metadata": metadata_result,
-                "analysis": analysis_result,
-                "search_document_id": search_result.get("document_id")
-            }
-        )
+        # Fill in the ID where the insights already reserve it: at the top
+        # level for generated insights, in processing_info for simulated ones
+        document_id = search_result.get("document_id")
+        processing_info = insights_result.get("processing_info")
+        if isinstance(processing_info, dict) and "search_document_id" in processing_info:
+            processing_info["search_document_id"] = document_id
+        else:
+            insights_result["search_document_id"] = document_id
         orchestration_result["steps"]["insights"] = {
             "status": "completed",
             "result": insights_result,
@@ -110,12 +117,12 @@ def orchestrator_function(context: df.DurableOrchestrationContext) -> Dict[str,
         }
         
         # Mark as completed
+        context.set_custom_status({"stage": "completed"})
+        end_time = context.current_utc_datetime
         orchestration_result["status"] = "completed"
-        orchestration_result["end_time"] = context.current_utc_datetime.isoformat()
+        orchestration_result["end_time"] = end_time.isoformat()
         
         # Calculate processing duration
-        start_time = datetime.fromisoformat(orchestration_result["start_time"].replace("Z", "+00:00"))
-        end_time = datetime.fromisoformat(orchestration_result["end_time"].replace("Z", "+00:00"))
         orchestration_result["processing_duration_seconds"] = (end_time - start_time).total_seconds()
         
         logging.info(f"Video processing completed successfully for: {video_info.get('blob_name')}")
@@ -129,6 +136,7 @@ def orchestrator_function(context: df.DurableOrchestrationContext) -> Dict[str,
         }
         orchestration_result["errors"].append(error_info)
         orchestration_result["status"] = "failed"
+        context.set_custom_status({"stage": "failed"})
         orchestration_result["end_time"] = context.current_utc_datetime.isoformat()
         
         logging.error(f"Orchestration failed for video {video_info.get('blob_name')}: {str(e)}")
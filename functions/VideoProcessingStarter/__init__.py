@@ -1,9 +1,27 @@
 import logging
 import json
+import re
 import azure.functions as func
 from azure.durable_functions import DurableOrchestrationClient
 
 
+# Video content types and extensions accepted for processing
+_VIDEO_CONTENT_TYPES = frozenset({
+    "video/mp4", 
+    "video/avi", 
+    "video/mov", 
+    "video/wmv", 
+    "video/flv", 
+    "video/webm",
+    "video/quicktime",
+    "video/x-msvideo"
+})
+_VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov", ".wmv", ".flv", ".webm", ".mkv")
+
+# Subject format: /blobServices/default/containers/{container-name}/blobs/{blob-name}
+_CONTAINER_PATTERN = re.compile(r"/containers/([^/]+)")
+
+
 async def main(event: func.EventGridEvent, starter: str) -> None:
     """
     Event Grid triggered function that starts the video processing orchestration.
@@ -17,22 +35,28 @@ async def main(event: func.EventGridEvent, starter: str) -> None:
         # Parse the Event Grid event
         event_data = event.get_json()
         
+        subject = event_data.get("subject") or ""
+        data = event_data.get("data") or {}
+        blob_name = subject.rsplit("/", 1)[-1] if subject else None
+        content_type = data.get("contentType", "")
+        
+        # Validate that this is a video file before building anything else
+        if not is_video_file(content_type, blob_name):
+            logging.info(f"Skipping non-video file: {blob_name}")
+            return
+        
         # Extract video information from the event
         video_info = {
             "blob_url": event_data.get("url"),
-            "blob_name": event_data.get("subject", "").split("/")[-1] if event_data.get("subject") else None,
-            "container_name": extract_container_name(event_data.get("subject", "")),
+            "blob_name": blob_name,
+            "container_name": extract_container_name(subject),
             "event_type": event_data.get("eventType"),
             "event_time": event_data.get("eventTime"),
-            "content_type": event_data.get("data", {}).get("contentType", ""),
-            "content_length": event_data.get("data", {}).get("contentLength", 0)
+            "content_type": content_type,
+            "content_length": data.get("contentLength", 0),
+            "etag": data.get("eTag")
         }
         
-        # Validate that this is a video file
-        if not is_video_file(video_info["content_type"], video_info["blob_name"]):
-            logging.info(f"Skipping non-video file: {video_info['blob_name']}")
-            return
-        
         # Create orchestration client
         client = DurableOrchestrationClient(starter)
         
@@ -52,13 +76,8 @@ async def main(event: func.EventGridEvent, starter: str) -> None:
 
 def extract_container_name(subject: str) -> str:
     """Extract container name from Event Grid subject path."""
-    # Subject format: /blobServices/default/containers/{container-name}/blobs/{blob-name}
-    try:
-        parts = subject.split("/")
-        container_index = parts.index("containers") + 1
-        return parts[container_index] if container_index < len(parts) else ""
-    except (ValueError, IndexError):
-        return ""
+    match = _CONTAINER_PATTERN.search(subject)
+    return match.group(1) if match else ""
 
 
 def is_video_file(content_type: str, blob_name: str) -> bool:
@@ -66,23 +85,11 @@ def is_video_file(content_type: str, blob_name: str) -> bool:
     Check if the uploaded file is a video based on content type and extension.
     """
     # Check content type
-    video_content_types = [
-        "video/mp4", 
-        "video/avi", 
-        "video/mov", 
-        "video/wmv", 
-        "video/flv", 
-        "video/webm",
-        "video/quicktime",
-        "video/x-msvideo"
-    ]
-    
-    if content_type and content_type.lower() in video_content_types:
+    if content_type and content_type.lower() in _VIDEO_CONTENT_TYPES:
         return True
     
     # Fallback: check file extension
     if blob_name:
-        video_extensions = [".mp4", ".avi", ".mov", ".wmv", ".flv", ".webm", ".mkv"]
-        return any(blob_name.lower().endswith(ext) for ext in video_extensions)
+        return blob_name.lower().endswith(_VIDEO_EXTENSIONS)
     
     return False
\ No newline at end of file
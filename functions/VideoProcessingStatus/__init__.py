@@ -1,10 +1,41 @@
 import logging
-import json
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from itertools import chain
+from typing import Dict, Any, Iterable, Optional
 import azure.functions as func
+import orjson
 from azure.durable_functions import DurableOrchestrationClient
 
 
+# Human-readable descriptions for each orchestration runtime status
+_STATUS_DESCRIPTIONS = {
+    "Running": {
+        "description": "Video processing is currently in progress",
+        "expected_actions": "Please wait for completion"
+    },
+    "Completed": {
+        "description": "Video processing completed successfully", 
+        "expected_actions": "Results are available in the output"
+    },
+    "Failed": {
+        "description": "Video processing failed",
+        "expected_actions": "Check error details and retry if needed"
+    },
+    "Canceled": {
+        "description": "Video processing was canceled",
+        "expected_actions": "Restart processing if needed"
+    },
+    "Terminated": {
+        "description": "Video processing was terminated",
+        "expected_actions": "Check logs and restart if needed"
+    },
+    "Pending": {
+        "description": "Video processing is queued and will start soon",
+        "expected_actions": "Please wait for processing to begin"
+    }
+}
+
+
 async def main(req: func.HttpRequest, starter: str) -> func.HttpResponse:
     """
     HTTP triggered function to check the status of video processing orchestrations.
@@ -16,6 +47,10 @@ async def main(req: func.HttpRequest, starter: str) -> func.HttpResponse:
     - GET /api/VideoProcessingStatus/{instanceId} - Get status of specific orchestration
     - GET /api/VideoProcessingStatus?video_name={name} - Get status by video name
     - GET /api/VideoProcessingStatus - List all recent orchestrations
+    
+    Responses are compact JSON; add `?pretty=1` for indented output. Send
+    `Accept: application/x-ndjson` to get the status as one JSON line
+    followed by one line per execution history event.
     """
     logging.info("Video processing status function processed a request.")
     
@@ -24,13 +59,18 @@ async def main(req: func.HttpRequest, starter: str) -> func.HttpResponse:
         instance_id = req.route_params.get('instanceId')
         video_name = req.params.get('video_name')
         include_history = req.params.get('include_history', 'false').lower() == 'true'
+        include_vectors = req.params.get('include_vectors', 'false').lower() == 'true'
+        ndjson = 'application/x-ndjson' in req.headers.get('Accept', '')
+        pretty = req.params.get('pretty') == '1'
         
         # Create orchestration client
         client = DurableOrchestrationClient(starter)
         
         if instance_id:
             # Get status for specific orchestration instance
-            status_result = await get_orchestration_status(client, instance_id, include_history)
+            status_result = await get_orchestration_status(
+                client, instance_id, include_history, include_vectors, stream_history=ndjson
+            )
         elif video_name:
             # Find orchestration by video name
             status_result = await find_orchestration_by_video_name(client, video_name, include_history)
@@ -38,33 +78,46 @@ async def main(req: func.HttpRequest, starter: str) -> func.HttpResponse:
             # List recent orchestrations
             status_result = await list_recent_orchestrations(client)
         
+        if ndjson:
+            return func.HttpResponse(
+                to_ndjson(status_result),
+                status_code=200,
+                mimetype="application/x-ndjson"
+            )
+        
         return func.HttpResponse(
-            json.dumps(status_result, indent=2, default=str),
+            orjson.dumps(
+                status_result,
+                option=orjson.OPT_NAIVE_UTC | (orjson.OPT_INDENT_2 if pretty else 0),
+                default=str
+            ),
             status_code=200,
-            headers={"Content-Type": "application/json"}
+            mimetype="application/json"
         )
     
     except ValueError as e:
         logging.error(f"Bad request: {e}")
         return func.HttpResponse(
-            json.dumps({"error": "Bad Request", "message": str(e)}),
+            orjson.dumps({"error": "Bad Request", "message": str(e)}),
             status_code=400,
-            headers={"Content-Type": "application/json"}
+            mimetype="application/json"
         )
     
     except Exception as e:
         logging.error(f"Error processing status request: {e}")
         return func.HttpResponse(
-            json.dumps({"error": "Internal Server Error", "message": str(e)}),
+            orjson.dumps({"error": "Internal Server Error", "message": str(e)}),
             status_code=500,
-            headers={"Content-Type": "application/json"}
+            mimetype="application/json"
         )
 
 
 async def get_orchestration_status(
     client: DurableOrchestrationClient, 
     instance_id: str, 
-    include_history: bool = False
+    include_history: bool = False,
+    include_vectors: bool = False,
+    stream_history: bool = False
 ) -> Dict[str, Any]:
     """
     Get the status of a specific orchestration instance.
@@ -73,6 +126,8 @@ async def get_orchestration_status(
         client: Durable orchestration client
         instance_id: Orchestration instance ID
         include_history: Whether to include execution history
+        include_vectors: Whether to include embedding vectors in the output
+        stream_history: Return the execution history as a lazy iterator
         
     Returns:
         Orchestration status information
@@ -88,22 +143,22 @@ async def get_orchestration_status(
         video_info = {}
         if status.input_:
             try:
-                input_data = json.loads(status.input_) if isinstance(status.input_, str) else status.input_
-                video_info = {
-                    "video_name": input_data.get("blob_name", "Unknown"),
-                    "container_name": input_data.get("container_name", "Unknown"),
-                    "blob_url": input_data.get("blob_url", "")
-                }
-            except (json.JSONDecodeError, AttributeError):
+                if isinstance(status.input_, str):
+                    video_info = parse_video_info(instance_id, status.input_)
+                else:
+                    video_info = extract_video_info(status.input_)
+            except (orjson.JSONDecodeError, AttributeError):
                 video_info = {"video_name": "Unable to parse"}
         
         # Parse output if available
         output_data = {}
         if status.output:
             try:
-                output_data = json.loads(status.output) if isinstance(status.output, str) else status.output
-            except (json.JSONDecodeError, AttributeError):
+                output_data = orjson.loads(status.output) if isinstance(status.output, str) else status.output
+            except (orjson.JSONDecodeError, AttributeError):
                 output_data = {"raw_output": str(status.output)}
+            if not include_vectors:
+                output_data = omit_vectors(output_data)
         
         # Calculate processing duration if completed
         processing_duration = None
@@ -113,7 +168,7 @@ async def get_orchestration_status(
         
         result = {
             "instance_id": instance_id,
-            "runtime_status": status.runtime_status.name if status.runtime_status else "Unknown",
+            "runtime_status": getattr(status.runtime_status, 'name', "Unknown"),
             "created_time": status.created_time.isoformat() if status.created_time else None,
             "last_updated_time": status.last_updated_time.isoformat() if status.last_updated_time else None,
             "processing_duration": processing_duration,
@@ -123,20 +178,16 @@ async def get_orchestration_status(
         }
         
         # Add execution history if requested
-        if include_history and hasattr(status, 'history_events') and status.history_events:
-            result["execution_history"] = [
-                {
-                    "name": event.name if hasattr(event, 'name') else str(event),
-                    "timestamp": event.timestamp.isoformat() if hasattr(event, 'timestamp') and event.timestamp else None,
-                    "event_type": event.event_type.name if hasattr(event, 'event_type') else "Unknown"
-                }
-                for event in status.history_events
-            ]
+        history_events = getattr(status, 'history_events', None) if include_history else None
+        if history_events:
+            history = map(format_history_event, history_events)
+            result["execution_history"] = history if stream_history else list(history)
         
         # Add management URLs
         result["management_urls"] = {
             "status_query": f"/api/VideoProcessingStatus/{instance_id}",
-            "status_with_history": f"/api/VideoProcessingStatus/{instance_id}?include_history=true"
+            "status_with_history": f"/api/VideoProcessingStatus/{instance_id}?include_history=true",
+            "status_with_vectors": f"/api/VideoProcessingStatus/{instance_id}?include_vectors=true"
         }
         
         return result
@@ -204,6 +255,113 @@ async def list_recent_orchestrations(client: DurableOrchestrationClient) -> Dict
         raise
 
 
+def parse_video_info(instance_id: str, raw_input: str) -> Dict[str, Any]:
+    """
+    Decode an orchestration input and extract its video information.
+    
+    An instance's input never changes, so repeated polls of the same
+    instance reuse the decoded result instead of parsing it again. The raw
+    input is part of the key so a reused instance ID is never served stale.
+    
+    Args:
+        instance_id: Orchestration instance ID
+        raw_input: JSON-encoded orchestration input
+        
+    Returns:
+        Video information from the input (a fresh copy per call)
+    """
+    # The values are strings, so a shallow copy keeps the cached dict intact
+    return dict(_parse_video_info(instance_id, raw_input))
+
+
+@lru_cache(maxsize=1024)
+def _parse_video_info(instance_id: str, raw_input: str) -> Dict[str, Any]:
+    """Cached decode for parse_video_info; the result is shared, never modify it."""
+    return extract_video_info(orjson.loads(raw_input))
+
+
+def extract_video_info(input_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Extract the video information reported by the status endpoint.
+    
+    Args:
+        input_data: Decoded orchestration input
+        
+    Returns:
+        Video name, container name and blob URL
+    """
+    return {
+        "video_name": input_data.get("blob_name", "Unknown"),
+        "container_name": input_data.get("container_name", "Unknown"),
+        "blob_url": input_data.get("blob_url", "")
+    }
+
+
+def format_history_event(event: Any) -> Dict[str, Any]:
+    """
+    Format a single execution history event.
+    
+    Args:
+        event: History event from the orchestration status
+        
+    Returns:
+        Event name, timestamp and type
+    """
+    timestamp = getattr(event, 'timestamp', None)
+    return {
+        "name": getattr(event, 'name', None) or str(event),
+        "timestamp": timestamp.isoformat() if timestamp else None,
+        "event_type": getattr(getattr(event, 'event_type', None), 'name', "Unknown")
+    }
+
+
+def to_ndjson(status_result: Dict[str, Any]) -> bytes:
+    """
+    Encode a status result as newline-delimited JSON.
+    
+    The first line is the status without its history; each history event
+    follows on its own line, encoded as it is produced from the iterator.
+    
+    Args:
+        status_result: Status result, optionally with an `execution_history` iterable
+        
+    Returns:
+        NDJSON response body
+    """
+    history: Iterable[Dict[str, Any]] = status_result.pop("execution_history", ())
+    lines = chain((status_result,), history)
+    return b"".join(orjson.dumps(line, option=orjson.OPT_NAIVE_UTC | orjson.OPT_APPEND_NEWLINE, default=str) for line in lines)
+
+
+def omit_vectors(value: Any) -> Any:
+    """
+    Replace embedding vectors in an orchestration output with a short summary.
+    
+    Vectors are found by key: `vector`, `vector_q8` (base64 int8) and any
+    key ending in `_vector`. Each one is replaced with its dimension.
+    
+    Args:
+        value: Decoded orchestration output
+        
+    Returns:
+        Copy of the output without vector values
+    """
+    if isinstance(value, dict):
+        result = {}
+        for key, item in value.items():
+            if key == "vector_q8" and isinstance(item, str):
+                # base64 length without padding -> number of int8 values
+                result[key] = {"dimension": len(item) * 3 // 4 - item[-2:].count("="), "omitted": True}
+            elif (key == "vector" or key.endswith("_vector")) and isinstance(item, list):
+                result[key] = {"dimension": len(item), "omitted": True}
+            else:
+                result[key] = omit_vectors(item)
+        return result
+    if isinstance(value, list):
+        return [omit_vectors(item) for item in value]
+    return value
+
+
 def format_runtime_status(status: str) -> Dict[str, str]:
     """
     Format runtime status with human-readable descriptions.
@@ -214,34 +372,10 @@ def format_runtime_status(status: str) -> Dict[str, str]:
     Returns:
         Formatted status information
     """
-    status_descriptions = {
-        "Running": {
-            "description": "Video processing is currently in progress",
-            "expected_actions": "Please wait for completion"
-        },
-        "Completed": {
-            "description": "Video processing completed successfully", 
-            "expected_actions": "Results are available in the output"
-        },
-        "Failed": {
-            "description": "Video processing failed",
-            "expected_actions": "Check error details and retry if needed"
-        },
-        "Canceled": {
-            "description": "Video processing was canceled",
-            "expected_actions": "Restart processing if needed"
-        },
-        "Terminated": {
-            "description": "Video processing was terminated",
-            "expected_actions": "Check logs and restart if needed"
-        },
-        "Pending": {
-            "description": "Video processing is queued and will start soon",
-            "expected_actions": "Please wait for processing to begin"
+    try:
+        return _STATUS_DESCRIPTIONS[status]
+    except KeyError:
+        return {
+            "description": f"Unknown status: {status}",
+            "expected_actions": "Contact support if this persists"
         }
-    }
-    
-    return status_descriptions.get(status, {
-        "description": f"Unknown status: {status}",
-        "expected_actions": "Contact support if this persists"
-    })
\ No newline at end of file
@@ -1,11 +1,26 @@
 """
 Shared client modules for Azure services.
 Provides centralized access to Azure AI, OpenAI, and Search services.
+
+Clients are imported on first access (PEP 562), so importing one client
+module doesn't load the SDKs of the others.
 """
 
-from .azure_ai_client import ContentUnderstandingClient, get_content_understanding_client
-from .openai_client import AzureOpenAIClient, get_openai_client
-from .search_client import AzureSearchClient, get_search_client
+import importlib
+
+# Public name -> defining submodule
+_LAZY_IMPORTS = {
+    "ContentUnderstandingClient": "azure_ai_client",
+    "get_content_understanding_client": "azure_ai_client",
+    "AzureOpenAIClient": "openai_client",
+    "get_openai_client": "openai_client",
+    "AzureSearchClient": "search_client",
+    "get_search_client": "search_client",
+    "build_odata_filter": "search_client",
+    "get_credential": "credentials",
+    "get_async_credential": "credentials",
+    "get_cogsvc_token_provider": "credentials",
+}
 
 __all__ = [
     "ContentUnderstandingClient",
@@ -13,5 +28,23 @@ __all__ = [
     "AzureOpenAIClient",
     "get_openai_client",
     "AzureSearchClient", 
-    "get_search_client"
-]
\ No newline at end of file
+    "get_search_client",
+    "build_odata_filter",
+    "get_credential",
+    "get_async_credential",
+    "get_cogsvc_token_provider"
+]
+
+
+def __getattr__(name):
+    try:
+        module_name = _LAZY_IMPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -3,14 +3,16 @@ Azure Content Understanding client wrapper.
 Uses a local implementation of the Content Understanding client.
 """
 
-import os
+import hashlib
 import logging
-from typing import Dict, Any, Optional
+from pathlib import Path
+from typing import Dict, Any, Iterator, Optional
+import requests
 from .content_understanding_client import AzureContentUnderstandingClient
-from azure.identity import DefaultAzureCredential, get_bearer_token_provider
-import uuid
-import json
-from datetime import datetime, timezone
+from .credentials import get_credential, get_cogsvc_token_provider
+import orjson
+from ..utils.config import Config
+from ..utils.timestamps import utcnow_iso
 
 
 class ContentUnderstandingClient:
@@ -18,8 +20,11 @@ class ContentUnderstandingClient:
     
     def __init__(self):
         """Initialize the Content Understanding client."""
-        self.endpoint = os.environ.get("AZURE_AI_SERVICE_ENDPOINT")
-        self.api_version = os.environ.get("AZURE_AI_SERVICE_API_VERSION", "2024-12-01-preview")
+        self.endpoint = Config.AZURE_AI_SERVICE_ENDPOINT
+        self.api_version = Config.AZURE_AI_SERVICE_API_VERSION
+        
+        # Analyzer IDs by template content hash, reused across videos
+        self._analyzer_ids: Dict[str, str] = {}
         
         # Set up authentication
         self._setup_authentication()
@@ -30,11 +35,8 @@ class ContentUnderstandingClient:
     def _setup_authentication(self):
         """Set up Azure authentication."""
         try:
-            self.credential = DefaultAzureCredential()
-            self.token_provider = get_bearer_token_provider(
-                self.credential, 
-                "https://cognitiveservices.azure.com/.default"
-            )
+            self.credential = get_credential()
+            self.token_provider = get_cogsvc_token_provider()
             logging.info("Azure Content Understanding authentication configured")
         except Exception as e:
             logging.error(f"Failed to set up authentication: {e}")
@@ -61,6 +63,9 @@ class ContentUnderstandingClient:
         """
         Analyze a video using Azure Content Understanding.
         
+        The analyzer for the template is reused across videos (see
+        `_get_analyzer_id`); it is recreated once if it disappeared.
+        
         Args:
             video_url: URL to the video file or local path
             video_name: Name for the video
@@ -71,26 +76,28 @@ class ContentUnderstandingClient:
             Analysis results dictionary
         """
         try:
-            # Generate unique analyzer ID
-            analyzer_id = f"video_analyzer_{video_name}_{uuid.uuid4()}"
-            
             logging.info(f"Starting video analysis for: {video_name}")
             
-            # Create analyzer with template
-            logging.info(f"Creating analyzer with ID: {analyzer_id}")
-            response = self.client.begin_create_analyzer(
-                analyzer_id, 
-                analyzer_template_path=analyzer_template_path
-            )
-            analyzer_result = self.client.poll_result(response)
-            logging.info(f"Analyzer created successfully: {analyzer_result}")
+            analyzer_id = self._get_analyzer_id(analyzer_template_path)
             
             # Submit video for analysis
             logging.info(f"Submitting video for analysis: {video_url}")
-            analysis_response = self.client.begin_analyze(
-                analyzer_id, 
-                file_location=video_url
-            )
+            try:
+                analysis_response = self.client.begin_analyze(
+                    analyzer_id, 
+                    file_location=video_url
+                )
+            except requests.HTTPError as e:
+                if e.response is None or e.response.status_code != 404:
+                    raise
+                # The analyzer was deleted since it was cached; recreate it once
+                logging.warning(f"Analyzer {analyzer_id} not found, recreating it")
+                self._analyzer_ids.pop(self._template_key(analyzer_template_path), None)
+                analyzer_id = self._get_analyzer_id(analyzer_template_path)
+                analysis_response = self.client.begin_analyze(
+                    analyzer_id, 
+                    file_location=video_url
+                )
             
             # Wait for analysis completion
             logging.info("Waiting for analysis completion...")
@@ -99,13 +106,6 @@ class ContentUnderstandingClient:
                 timeout_seconds=timeout_seconds
             )
             
-            # Clean up analyzer
-            try:
-                self.client.delete_analyzer(analyzer_id)
-                logging.info(f"Analyzer {analyzer_id} deleted")
-            except Exception as e:
-                logging.warning(f"Failed to delete analyzer {analyzer_id}: {e}")
-            
             logging.info(f"Video analysis completed for: {video_name}")
             return analysis_result
             
@@ -113,6 +113,78 @@ class ContentUnderstandingClient:
             logging.error(f"Error analyzing video {video_name}: {e}")
             raise
     
+    @staticmethod
+    def _template_key(analyzer_template_path: str) -> str:
+        """Hash the analyzer template contents into a stable key."""
+        return hashlib.blake2b(Path(analyzer_template_path).read_bytes(), digest_size=16).hexdigest()
+    
+    def _get_analyzer_id(self, analyzer_template_path: str) -> str:
+        """
+        Get the ID of an analyzer built from the given template, creating it if needed.
+        
+        The analyzer ID is derived from a hash of the template contents, so
+        every worker instance converges on the same analyzer and an edited
+        template gets a new one. Known IDs are cached per worker, skipping
+        the lookup and create round-trips for later videos.
+        
+        Args:
+            analyzer_template_path: Path to analyzer configuration JSON
+            
+        Returns:
+            Analyzer ID
+        """
+        key = self._template_key(analyzer_template_path)
+        analyzer_id = self._analyzer_ids.get(key)
+        if analyzer_id is not None:
+            return analyzer_id
+        
+        analyzer_id = f"video_analyzer_{key}"
+        try:
+            self.client.get_analyzer_detail_by_id(analyzer_id)
+            logging.info(f"Reusing existing analyzer: {analyzer_id}")
+        except requests.HTTPError as e:
+            if e.response is None or e.response.status_code != 404:
+                raise
+            
+            # Create analyzer with template
+            logging.info(f"Creating analyzer with ID: {analyzer_id}")
+            try:
+                response = self.client.begin_create_analyzer(
+                    analyzer_id, 
+                    analyzer_template_path=analyzer_template_path
+                )
+                analyzer_result = self.client.poll_result(response)
+                logging.info(f"Analyzer created successfully: {analyzer_result}")
+            except requests.HTTPError as e:
+                # Another instance created it in the meantime
+                if e.response is None or e.response.status_code != 409:
+                    raise
+                logging.info(f"Analyzer {analyzer_id} was created concurrently")
+        
+        self._analyzer_ids[key] = analyzer_id
+        return analyzer_id
+    
+    def iter_video_segments(self, analysis_result: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily yield the video segments of an analysis result.
+        
+        Segments are produced one at a time, so a consumer such as an
+        indexer or embedding batcher never holds the full processed list.
+        
+        Args:
+            analysis_result: Raw analysis result from Content Understanding
+            
+        Yields:
+            Processed segments with their 1-based segment ID; the serialized
+            text is available as the `text_content` attribute, built on first
+            access (see `_LazySegment`)
+        """
+        if not analysis_result or "result" not in analysis_result:
+            raise ValueError("Invalid analysis result format")
+        
+        for i, segment in enumerate(analysis_result["result"].get("contents", []), 1):
+            yield _LazySegment(i, segment)
+    
     def extract_video_segments(self, analysis_result: Dict[str, Any]) -> Dict[str, Any]:
         """
         Extract and process video segments from analysis results.
@@ -124,26 +196,16 @@ class ContentUnderstandingClient:
             Processed segments with metadata
         """
         try:
-            if not analysis_result or "result" not in analysis_result:
-                raise ValueError("Invalid analysis result format")
-            
-            contents = analysis_result["result"].get("contents", [])
-            
-            # Process segments
-            segments = []
-            for i, segment in enumerate(contents):
-                processed_segment = {
-                    "segment_id": i + 1,
-                    "content": segment,
-                    "text_content": json.dumps(segment) if isinstance(segment, dict) else str(segment)
-                }
-                segments.append(processed_segment)
+            segments = [
+                dict(segment, text_content=segment.text_content)
+                for segment in self.iter_video_segments(analysis_result)
+            ]
             
             result = {
                 "total_segments": len(segments),
                 "segments": segments,
                 "analysis_metadata": {
-                    "processed_at": datetime.now(timezone.utc).isoformat(),
+                    "processed_at": utcnow_iso(),
                     "original_result_keys": list(analysis_result.keys()) if isinstance(analysis_result, dict) else []
                 }
             }
@@ -156,6 +218,33 @@ class ContentUnderstandingClient:
             raise
 
 
+def segment_text(segment: Any) -> str:
+    """Serialize a video segment to the text used for embeddings."""
+    return orjson.dumps(segment).decode() if isinstance(segment, dict) else str(segment)
+
+
+class _LazySegment(dict):
+    """
+    A processed segment whose serialized text is built on demand.
+    
+    The dict holds `segment_id` and `content`. Search indexing reads
+    `content` and embeddings read the `text_content` property; the string
+    is only built, once, when that property is first read.
+    """
+    
+    __slots__ = ("_text_content",)
+    
+    def __init__(self, segment_id: int, content: Any):
+        super().__init__(segment_id=segment_id, content=content)
+        self._text_content = None
+    
+    @property
+    def text_content(self) -> str:
+        if self._text_content is None:
+            self._text_content = segment_text(self["content"])
+        return self._text_content
+
+
 # Singleton pattern for client reuse
 _content_understanding_client = None
 
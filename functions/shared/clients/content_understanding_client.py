@@ -1,7 +1,8 @@
 import requests
+from requests.adapters import HTTPAdapter
 from requests.models import Response
 import logging
-import json
+import orjson
 import time
 from pathlib import Path
 
@@ -14,6 +15,7 @@ class AzureContentUnderstandingClient:
         subscription_key: str = None,
         token_provider: callable = None,
         x_ms_useragent: str = "cu-sample-code",
+        pool_maxsize: int = 16,
     ):
         if not subscription_key and not token_provider:
             raise ValueError(
@@ -30,6 +32,15 @@ class AzureContentUnderstandingClient:
         self._headers = self._get_headers(
             subscription_key, token_provider(), x_ms_useragent
         )
+        # Keep-alive connections shared by all requests, including polling
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def close(self):
+        """Closes the pooled HTTP connections."""
+        self._session.close()
 
     def _get_analyzer_url(self, endpoint, api_version, analyzer_id):
         return f"{endpoint}/contentunderstanding/analyzers/{analyzer_id}?api-version={api_version}"  # noqa
@@ -80,12 +91,12 @@ class AzureContentUnderstandingClient:
         Raises:
             requests.exceptions.HTTPError: If the HTTP request returned an unsuccessful status code.
         """
-        response = requests.get(
+        response = self._session.get(
             url=self._get_analyzer_list_url(self._endpoint, self._api_version),
             headers=self._headers,
         )
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
 
     def get_analyzer_detail_by_id(self, analyzer_id):
         """
@@ -101,12 +112,12 @@ class AzureContentUnderstandingClient:
         Raises:
             HTTPError: If the request fails.
         """
-        response = requests.get(
+        response = self._session.get(
             url=self._get_analyzer_url(self._endpoint, self._api_version, analyzer_id),
             headers=self._headers,
         )
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
 
     def begin_create_analyzer(
         self,
@@ -134,8 +145,7 @@ class AzureContentUnderstandingClient:
             requests.Response: The response object from the HTTP request.
         """
         if analyzer_template_path and Path(analyzer_template_path).exists():
-            with open(analyzer_template_path, "r") as file:
-                analyzer_template = json.load(file)
+            analyzer_template = orjson.loads(Path(analyzer_template_path).read_bytes())
 
         if not analyzer_template:
             raise ValueError("Analyzer schema must be provided.")
@@ -152,10 +162,10 @@ class AzureContentUnderstandingClient:
         headers = {"Content-Type": "application/json"}
         headers.update(self._headers)
 
-        response = requests.put(
+        response = self._session.put(
             url=self._get_analyzer_url(self._endpoint, self._api_version, analyzer_id),
             headers=headers,
-            json=analyzer_template,
+            data=orjson.dumps(analyzer_template),
         )
         response.raise_for_status()
         self._logger.info(f"Analyzer {analyzer_id} create request accepted.")
@@ -174,7 +184,7 @@ class AzureContentUnderstandingClient:
         Raises:
             HTTPError: If the delete request fails.
         """
-        response = requests.delete(
+        response = self._session.delete(
             url=self._get_analyzer_url(self._endpoint, self._api_version, analyzer_id),
             headers=self._headers,
         )
@@ -210,15 +220,15 @@ class AzureContentUnderstandingClient:
 
         headers.update(self._headers)
         if isinstance(data, dict):
-            response = requests.post(
+            response = self._session.post(
                 url=self._get_analyze_url(
                     self._endpoint, self._api_version, analyzer_id
                 ),
                 headers=headers,
-                json=data,
+                data=orjson.dumps(data),
             )
         else:
-            response = requests.post(
+            response = self._session.post(
                 url=self._get_analyze_url(
                     self._endpoint, self._api_version, analyzer_id
                 ),
@@ -252,7 +262,7 @@ class AzureContentUnderstandingClient:
             f"{operation_location}/images/{image_id}?api-version={self._api_version}"
         )
         try:
-            response = requests.get(url=image_retrieval_url, headers=self._headers)
+            response = self._session.get(url=image_retrieval_url, headers=self._headers)
             response.raise_for_status()
 
             assert response.headers.get("Content-Type") == "image/jpeg"
@@ -266,15 +276,23 @@ class AzureContentUnderstandingClient:
         self,
         response: Response,
         timeout_seconds: int = 120,
-        polling_interval_seconds: int = 2,
+        polling_interval_seconds: float = 0.5,
+        max_polling_interval_seconds: float = 5,
+        backoff_factor: float = 1.5,
     ):
         """
         Polls the result of an asynchronous operation until it completes or times out.
 
+        The delay between polls starts at `polling_interval_seconds` and grows by
+        `backoff_factor` up to `max_polling_interval_seconds`. A `Retry-After`
+        header returned by the service takes precedence over the computed delay.
+
         Args:
             response (Response): The initial response object containing the operation location.
             timeout_seconds (int, optional): The maximum number of seconds to wait for the operation to complete. Defaults to 120.
-            polling_interval_seconds (int, optional): The number of seconds to wait between polling attempts. Defaults to 2.
+            polling_interval_seconds (float, optional): The initial number of seconds to wait between polling attempts. Defaults to 0.5.
+            max_polling_interval_seconds (float, optional): The maximum number of seconds to wait between polling attempts. Defaults to 5.
+            backoff_factor (float, optional): The multiplier applied to the delay after each attempt. Defaults to 1.5.
 
         Raises:
             ValueError: If the operation location is not found in the response headers.
@@ -288,9 +306,7 @@ class AzureContentUnderstandingClient:
         if not operation_location:
             raise ValueError("Operation location not found in response headers.")
 
-        headers = {"Content-Type": "application/json"}
-        headers.update(self._headers)
-
+        delay = polling_interval_seconds
         start_time = time.time()
         while True:
             elapsed_time = time.time() - start_time
@@ -299,19 +315,31 @@ class AzureContentUnderstandingClient:
                     f"Operation timed out after {timeout_seconds:.2f} seconds."
                 )
 
-            response = requests.get(operation_location, headers=self._headers)
+            response = self._session.get(operation_location, headers=self._headers)
             response.raise_for_status()
-            status = response.json().get("status").lower()
+            # Parse each poll response once; results can be several MB
+            result = orjson.loads(response.content)
+            status = result.get("status").lower()
             if status == "succeeded":
                 self._logger.info(
                     f"Request result is ready after {elapsed_time:.2f} seconds."
                 )
-                return response.json()
+                return result
             elif status == "failed":
-                self._logger.error(f"Request failed. Reason: {response.json()}")
+                self._logger.error(f"Request failed. Reason: {result}")
                 raise RuntimeError("Request failed.")
             else:
                 self._logger.info(
                     f"Request {operation_location.split('/')[-1].split('?')[0]} in progress ..."
                 )
-            time.sleep(polling_interval_seconds)
\ No newline at end of file
+            time.sleep(self._get_retry_after(response, delay))
+            delay = min(delay * backoff_factor, max_polling_interval_seconds)
+
+    def _get_retry_after(self, response: Response, default_seconds: float):
+        """Returns the delay requested by the `Retry-After` header, or the default."""
+        retry_after = response.headers.get("retry-after")
+        try:
+            return max(float(retry_after), 0) if retry_after else default_seconds
+        except ValueError:
+            # HTTP-date values are not used by this service; fall back to backoff
+            return default_seconds
@@ -0,0 +1,50 @@
+"""
+Shared Azure credential for all service clients.
+Creates one DefaultAzureCredential per worker so its token cache is reused.
+"""
+
+import threading
+from typing import Callable
+from azure.identity import DefaultAzureCredential, get_bearer_token_provider
+from azure.identity.aio import DefaultAzureCredential as AsyncDefaultAzureCredential
+
+
+# Scope for Azure AI services (Content Understanding and Azure OpenAI)
+COGNITIVE_SERVICES_SCOPE = "https://cognitiveservices.azure.com/.default"
+
+# Global instances for reuse; created under the lock, read without it
+_credential = None
+_cogsvc_token_provider = None
+_async_credential = None
+_credential_lock = threading.Lock()
+
+
+def get_credential() -> DefaultAzureCredential:
+    """Get a singleton instance of the default Azure credential."""
+    global _credential
+    if _credential is None:
+        with _credential_lock:
+            if _credential is None:
+                _credential = DefaultAzureCredential()
+    return _credential
+
+
+def get_async_credential() -> AsyncDefaultAzureCredential:
+    """Get a singleton instance of the async default Azure credential, for the aio SDK clients."""
+    global _async_credential
+    if _async_credential is None:
+        with _credential_lock:
+            if _async_credential is None:
+                _async_credential = AsyncDefaultAzureCredential()
+    return _async_credential
+
+
+def get_cogsvc_token_provider() -> Callable[[], str]:
+    """Get a singleton bearer token provider for Azure AI services."""
+    global _cogsvc_token_provider
+    if _cogsvc_token_provider is None:
+        credential = get_credential()
+        with _credential_lock:
+            if _cogsvc_token_provider is None:
+                _cogsvc_token_provider = get_bearer_token_provider(credential, COGNITIVE_SERVICES_SCOPE)
+    return _cogsvc_token_provider
@@ -3,13 +3,67 @@ Azure OpenAI client using the official OpenAI library.
 Handles embeddings and chat completions with Azure OpenAI services.
 """
 
-import os
+import asyncio
 import logging
-from typing import Dict, Any, List, Optional
-from openai import AzureOpenAI
-from azure.identity import DefaultAzureCredential, get_bearer_token_provider
+from collections import defaultdict
+from itertools import islice
+from typing import Dict, Any, Iterable, List, Optional
+import httpx
+import numpy as np
+from openai import AsyncAzureOpenAI, DEFAULT_TIMEOUT
+from .credentials import get_cogsvc_token_provider
 import json
 from datetime import datetime, timezone
+from ..utils.config import Config
+
+
+# Connection pool limits for the HTTP client shared by all OpenAI requests
+_HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=300)
+
+# Prompts for generate_video_insights, built once per worker
+_SYSTEM_MSG = """You are an expert video content analyst. Your task is to generate useful and actionable insights 
+based on automatic video analysis. Provide a structured analysis that includes:
+
+1. Executive summary of the content
+2. Key points and takeaways
+3. Target audience analysis
+4. Expected engagement metrics
+5. Optimization recommendations
+6. Search keywords
+
+Respond in valid JSON format with the specified structure."""
+
+_USER_TEMPLATE = """Analyze this video and provide detailed insights:
+
+Video Information:
+- Name: {video_name}
+- Duration: {duration_minutes} minutes
+- Size: {file_size_mb} MB
+- Language: {language}
+
+Transcript:
+{transcript_head}...
+
+Main Topics:
+{topics_csv}
+
+Detected Labels:
+{labels_csv}
+
+Additional Information:
+- Scenes: {scenes_count}
+- Faces detected: {faces_detected}
+- Keyframes: {keyframes_count}
+"""
+
+# Numeric fields default to 0 rather than "N/A"
+_USER_DEFAULTS = {
+    "duration_minutes": 0,
+    "file_size_mb": 0,
+    "scenes_count": 0,
+    "faces_detected": 0,
+    "keyframes_count": 0,
+}
 
 
 class AzureOpenAIClient:
@@ -17,10 +71,12 @@ class AzureOpenAIClient:
     
     def __init__(self):
         """Initialize the Azure OpenAI client."""
-        self.endpoint = os.environ.get("AZURE_OPENAI_ENDPOINT")
-        self.chat_deployment = os.environ.get("AZURE_OPENAI_CHAT_DEPLOYMENT_NAME")
-        self.embedding_deployment = os.environ.get("AZURE_OPENAI_EMBEDDING_DEPLOYMENT_NAME")
-        self.api_key = os.environ.get("AZURE_OPENAI_API_KEY")
+        self.endpoint = Config.AZURE_OPENAI_ENDPOINT
+        self.chat_deployment = Config.AZURE_OPENAI_CHAT_DEPLOYMENT_NAME
+        self.embedding_deployment = Config.AZURE_OPENAI_EMBEDDING_DEPLOYMENT_NAME
+        self.api_key = Config.AZURE_OPENAI_API_KEY
+        # The SDK retries 429/5xx responses and waits for the Retry-After header
+        self.max_retries = Config.AZURE_OPENAI_MAX_RETRIES
         
         # Setup authentication and client
         self._setup_client()
@@ -31,26 +87,30 @@ class AzureOpenAIClient:
             raise ValueError("AZURE_OPENAI_ENDPOINT not configured")
         
         try:
+            # One pooled HTTP client per worker, so warm invocations reuse
+            # open TLS connections for embeddings and chat requests
+            self.http_client = httpx.AsyncClient(limits=_HTTP_LIMITS, timeout=DEFAULT_TIMEOUT)
+            
             if self.api_key:
                 # Use API key authentication
-                self.client = AzureOpenAI(
+                self.client = AsyncAzureOpenAI(
                     azure_endpoint=self.endpoint,
                     api_key=self.api_key,
-                    api_version="2024-08-01-preview"
+                    api_version="2024-08-01-preview",
+                    max_retries=self.max_retries,
+                    http_client=self.http_client
                 )
                 logging.info("Azure OpenAI client configured with API key")
             else:
                 # Use managed identity authentication  
-                credential = DefaultAzureCredential()
-                token_provider = get_bearer_token_provider(
-                    credential, 
-                    "https://cognitiveservices.azure.com/.default"
-                )
+                token_provider = get_cogsvc_token_provider()
                 
-                self.client = AzureOpenAI(
+                self.client = AsyncAzureOpenAI(
                     azure_endpoint=self.endpoint,
                     azure_ad_token_provider=token_provider,
-                    api_version="2024-08-01-preview"
+                    api_version="2024-08-01-preview",
+                    max_retries=self.max_retries,
+                    http_client=self.http_client
                 )
                 logging.info("Azure OpenAI client configured with managed identity")
                 
@@ -58,47 +118,74 @@ class AzureOpenAIClient:
             logging.error(f"Failed to setup Azure OpenAI client: {e}")
             raise
     
-    def generate_embeddings(self, texts: List[str], deployment_name: Optional[str] = None) -> List[List[float]]:
+    async def generate_embeddings(self, texts: Iterable[str], deployment_name: Optional[str] = None) -> np.ndarray:
         """
-        Generate embeddings for a list of texts.
+        Generate embeddings for an iterable of texts.
+        
+        Each batch of texts is sent as a single multi-input request. Batches
+        are sent concurrently, at most `EMBEDDING_MAX_CONCURRENCY` at a time,
+        and the returned vectors are in the same order as the input texts.
+        Texts are pulled from the iterable one batch at a time, only when a
+        request slot is free, so a generator input is never fully materialized.
         
         Args:
-            texts: List of texts to embed
+            texts: Texts to embed (any iterable, e.g. a generator)
             deployment_name: Optional deployment name override
             
         Returns:
-            List of embedding vectors
+            float32 array of shape (number of texts, dimension), one row per text
         """
         deployment = deployment_name or self.embedding_deployment
         if not deployment:
             raise ValueError("Embedding deployment name not configured")
         
-        try:
-            embeddings = []
-            
-            # Process texts in batches to respect rate limits
-            batch_size = 16
-            
-            for i in range(0, len(texts), batch_size):
-                batch = texts[i:i + batch_size]
-                
-                response = self.client.embeddings.create(
+        # Process texts in batches to respect rate limits
+        batch_size = Config.EMBEDDING_BATCH_SIZE
+        semaphore = asyncio.Semaphore(Config.EMBEDDING_MAX_CONCURRENCY)
+        
+        async def embed_batch(batch_number: int, batch: List[str]) -> np.ndarray:
+            try:
+                response = await self.client.embeddings.create(
                     model=deployment,
                     input=batch
                 )
-                
-                batch_embeddings = [item.embedding for item in response.data]
-                embeddings.extend(batch_embeddings)
-                
-                logging.info(f"Generated embeddings for batch {i//batch_size + 1}/{(len(texts) + batch_size - 1)//batch_size}")
+            finally:
+                semaphore.release()
+            logging.info(f"Generated embeddings for batch {batch_number}")
+            return np.asarray([item.embedding for item in response.data], dtype=np.float32)
+        
+        texts_iter = iter(texts)
+        tasks = []
+        try:
+            while True:
+                await semaphore.acquire()
+                # A failed batch frees its slot; stop sending requests and raise it
+                for task in tasks:
+                    if task.done() and not task.cancelled() and task.exception() is not None:
+                        raise task.exception()
+                batch = list(islice(texts_iter, batch_size))
+                if not batch:
+                    semaphore.release()
+                    break
+                tasks.append(asyncio.ensure_future(embed_batch(len(tasks) + 1, batch)))
             
-            return embeddings
+            # gather preserves batch order regardless of completion order
+            results = await asyncio.gather(*tasks)
             
         except Exception as e:
             logging.error(f"Error generating embeddings: {e}")
             raise
+        finally:
+            # Drop batches still in flight after a failure or a cancellation
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+        
+        if not results:
+            return np.empty((0, Config.AZURE_OPENAI_EMBEDDING_DIMENSION), dtype=np.float32)
+        return np.concatenate(results)
     
-    def generate_single_embedding(self, text: str, deployment_name: Optional[str] = None) -> List[float]:
+    async def generate_single_embedding(self, text: str, deployment_name: Optional[str] = None) -> List[float]:
         """
         Generate embedding for a single text.
         
@@ -109,10 +196,10 @@ class AzureOpenAIClient:
         Returns:
             Embedding vector
         """
-        embeddings = self.generate_embeddings([text], deployment_name)
-        return embeddings[0] if embeddings else []
+        embeddings = await self.generate_embeddings([text], deployment_name)
+        return embeddings[0].tolist() if len(embeddings) else []
     
-    def chat_completion(
+    async def chat_completion(
         self, 
         messages: List[Dict[str, str]], 
         deployment_name: Optional[str] = None,
@@ -136,7 +223,7 @@ class AzureOpenAIClient:
             raise ValueError("Chat deployment name not configured")
         
         try:
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=deployment,
                 messages=messages,
                 temperature=temperature,
@@ -149,7 +236,7 @@ class AzureOpenAIClient:
             logging.error(f"Error generating chat completion: {e}")
             raise
     
-    def generate_video_insights(
+    async def generate_video_insights(
         self, 
         video_context: Dict[str, Any], 
         deployment_name: Optional[str] = None
@@ -164,49 +251,21 @@ class AzureOpenAIClient:
         Returns:
             Structured insights dictionary
         """
-        # Create structured prompt for video analysis in English
-        system_message = """You are an expert video content analyst. Your task is to generate useful and actionable insights 
-        based on automatic video analysis. Provide a structured analysis that includes:
-
-        1. Executive summary of the content
-        2. Key points and takeaways
-        3. Target audience analysis
-        4. Expected engagement metrics
-        5. Optimization recommendations
-        6. Search keywords
-
-        Respond in valid JSON format with the specified structure."""
-        
-        user_message = f"""Analyze this video and provide detailed insights:
-
-        Video Information:
-        - Name: {video_context.get('video_name', 'N/A')}
-        - Duration: {video_context.get('duration_minutes', 0)} minutes
-        - Size: {video_context.get('file_size_mb', 0)} MB
-        - Language: {video_context.get('language', 'N/A')}
-
-        Transcript:
-        {video_context.get('transcript', 'Not available')[:2000]}...
-
-        Main Topics:
-        {', '.join(video_context.get('topics', []))}
-
-        Detected Labels:
-        {', '.join(video_context.get('labels', []))}
-
-        Additional Information:
-        - Scenes: {video_context.get('scenes_count', 0)}
-        - Faces detected: {video_context.get('faces_detected', 0)}
-        - Keyframes: {video_context.get('keyframes_count', 0)}
-        """
+        # Missing keys fall back to the defaults instead of .get() chains
+        ctx = defaultdict(lambda: "N/A", _USER_DEFAULTS)
+        ctx.update(video_context)
+        ctx["transcript_head"] = (video_context.get("transcript") or "Not available")[:2000]
+        ctx["topics_csv"] = ", ".join(video_context.get("topics") or ())
+        ctx["labels_csv"] = ", ".join(video_context.get("labels") or ())
+        user_message = _USER_TEMPLATE.format_map(ctx)
         
         messages = [
-            {"role": "system", "content": system_message},
+            {"role": "system", "content": _SYSTEM_MSG},
             {"role": "user", "content": user_message}
         ]
         
         try:
-            response = self.chat_completion(messages, deployment_name, temperature=0.3, max_tokens=2000)
+            response = await self.chat_completion(messages, deployment_name, temperature=0.3, max_tokens=2000)
             
             # Try to parse as JSON, fallback to structured text if needed
             try:
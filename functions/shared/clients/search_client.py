@@ -1,64 +1,168 @@
 """
-Azure Cognitive Search client using official Azure SDK.
+Azure Cognitive Search client using the official async Azure SDK.
 Handles document indexing and semantic search operations.
 """
 
-import os
+import asyncio
+import atexit
 import logging
+import math
+import threading
+from datetime import datetime, timezone
+from functools import lru_cache
+from itertools import chain
 from typing import Dict, Any, List, Optional
-from azure.search.documents import SearchClient
-from azure.search.documents.indexes import SearchIndexClient
+from azure.search.documents.aio import SearchClient
+from azure.search.documents.indexes.aio import SearchIndexClient
 from azure.search.documents.models import VectorizedQuery
-from azure.identity import DefaultAzureCredential
+from .credentials import get_async_credential
+from .semantic_cache import SemanticCache
 from azure.core.credentials import AzureKeyCredential
-import json
-from datetime import datetime
+from azure.core.pipeline.transport import AioHttpTransport
+import aiohttp
+import numpy as np
+from ..utils.config import Config
+from ..utils.vectors import int8_quantize
+
+
+# Azure Search accepts at most 1000 documents per indexing request
+_MAX_UPLOAD_BATCH_SIZE = 1000
+
+# IDs per search.in lookup in get_documents
+_MAX_LOOKUP_BATCH_SIZE = 100
+
+# search.in delimiter for ID lookups. Document keys may only hold letters,
+# digits, '_', '-' and '=', so it can't split a valid key in two.
+_LOOKUP_DELIMITER = "|"
+
+# Upper bound on open connections to the Search service per client
+_MAX_POOL_CONNECTIONS = 64
 
 
 class AzureSearchClient:
-    """Client for Azure Cognitive Search using official Azure SDK."""
+    """
+    Client for Azure Cognitive Search using the official async Azure SDK.
     
-    def __init__(self):
-        """Initialize the Azure Search client."""
-        self.endpoint = os.environ.get("AZURE_SEARCH_ENDPOINT")
-        self.index_name = os.environ.get("AZURE_SEARCH_INDEX_NAME", "videos")
-        self.admin_key = os.environ.get("AZURE_SEARCH_ADMIN_KEY")
+    The HTTP session and SDK clients are created on first use, inside the
+    event loop that makes the call, and are bound to that loop. Short-lived
+    clients can be used as `async with AzureSearchClient() as client:`; the
+    shared one from `get_search_client` lives as long as the worker and is
+    closed at exit.
+    """
+    
+    def __init__(self, max_connections: int = 8):
+        """
+        Initialize the Azure Search client.
+        
+        Args:
+            max_connections: Number of upload batches sent concurrently
+        """
+        self.endpoint = Config.AZURE_SEARCH_ENDPOINT
+        self.index_name = Config.AZURE_SEARCH_INDEX_NAME
+        self.admin_key = Config.AZURE_SEARCH_ADMIN_KEY
+        self.max_connections = max_connections
+        
+        # Results of recent vector queries, dropped whenever this client writes
+        self._semantic_cache = SemanticCache(
+            max_entries=Config.SEMANTIC_CACHE_MAX_ENTRIES,
+            threshold=Config.SEMANTIC_CACHE_THRESHOLD,
+            ttl_seconds=Config.SEMANTIC_CACHE_TTL_SECONDS
+        ) if Config.SEMANTIC_CACHE_MAX_ENTRIES > 0 else None
+        
+        # Session and SDK clients, created by _open on the first request
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.search_client: Optional[SearchClient] = None
+        self.index_client: Optional[SearchIndexClient] = None
         
         # Setup clients
         self._setup_clients()
     
     def _setup_clients(self):
-        """Set up Azure Search clients with proper authentication."""
+        """Choose the Azure Search authentication; the clients themselves are created by _open."""
         if not self.endpoint:
             raise ValueError("AZURE_SEARCH_ENDPOINT not configured")
         
         try:
             if self.admin_key:
                 # Use API key authentication
-                credential = AzureKeyCredential(self.admin_key)
+                self._credential = AzureKeyCredential(self.admin_key)
                 logging.info("Azure Search client configured with admin key")
             else:
                 # Use managed identity authentication
-                credential = DefaultAzureCredential()
+                self._credential = get_async_credential()
                 logging.info("Azure Search client configured with managed identity")
             
-            # Initialize clients
-            self.search_client = SearchClient(
-                endpoint=self.endpoint,
-                index_name=self.index_name,
-                credential=credential
-            )
-            
-            self.index_client = SearchIndexClient(
-                endpoint=self.endpoint,
-                credential=credential
-            )
-            
         except Exception as e:
             logging.error(f"Failed to setup Azure Search clients: {e}")
             raise
     
-    def upload_document(self, document: Dict[str, Any]) -> Dict[str, Any]:
+    async def _open(self) -> None:
+        """
+        Create the HTTP session and SDK clients on first use.
+        
+        aiohttp sessions bind to the running loop, so this runs inside the
+        caller's coroutine rather than in the synchronous constructor. No
+        await happens between the check and the assignment, so concurrent
+        first requests on one loop still create a single session.
+        """
+        if self._session is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        
+        # One bounded aiohttp session for both clients. The transport
+        # doesn't own it, so closing one client leaves the other usable.
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=max(self.max_connections, _MAX_POOL_CONNECTIONS)),
+            auto_decompress=False
+        )
+        transport = AioHttpTransport(session=self._session, session_owner=False)
+        
+        self.search_client = SearchClient(
+            endpoint=self.endpoint,
+            index_name=self.index_name,
+            credential=self._credential,
+            transport=transport
+        )
+        
+        self.index_client = SearchIndexClient(
+            endpoint=self.endpoint,
+            credential=self._credential,
+            transport=transport
+        )
+    
+    async def close(self):
+        """Close the underlying clients and their shared HTTP session, if opened."""
+        if self._session is None:
+            return
+        session, self._session = self._session, None
+        await self.search_client.close()
+        await self.index_client.close()
+        await session.close()
+    
+    def _close_at_exit(self) -> None:
+        """
+        atexit hook: run close() on the loop the session was opened on.
+        
+        A loop that is already closed can't run it, and neither can one that
+        is still running (exit from inside a callback); the process is then
+        ending and the OS reclaims the sockets.
+        """
+        loop = self._loop
+        if self._session is None or loop is None or loop.is_closed() or loop.is_running():
+            return
+        try:
+            loop.run_until_complete(self.close())
+        except Exception as e:
+            logging.debug(f"Could not close Azure Search client at exit: {e}")
+    
+    async def __aenter__(self) -> "AzureSearchClient":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+    
+    async def upload_document(self, document: Dict[str, Any]) -> Dict[str, Any]:
         """
         Upload a single document to the search index.
         
@@ -68,12 +172,15 @@ class AzureSearchClient:
         Returns:
             Upload result
         """
-        return self.upload_documents([document])
+        return await self.upload_documents([document])
     
-    def upload_documents(self, documents: List[Dict[str, Any]]) -> Dict[str, Any]:
+    async def upload_documents(self, documents: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Upload multiple documents to the search index.
         
+        Documents are split into batches of at most 1000 (the service limit)
+        and the batches are sent concurrently, up to `max_connections` of them.
+        
         Args:
             documents: List of documents to upload
             
@@ -81,21 +188,29 @@ class AzureSearchClient:
             Batch upload result
         """
         try:
-            # Upload documents using the official client
-            result = self.search_client.upload_documents(documents=documents)
+            await self._open()
+            self._clear_semantic_cache()
+            documents = [_to_json_compatible(doc) for doc in documents]
+            batch_size = min(_MAX_UPLOAD_BATCH_SIZE, math.ceil(len(documents) / self.max_connections)) or 1
+            batches = [documents[i:i + batch_size] for i in range(0, len(documents), batch_size)]
             
-            # Process results
-            successful_count = 0
-            failed_docs = []
+            # Upload documents using the official client
+            if len(batches) == 1:
+                results = await self.search_client.upload_documents(documents=batches[0])
+            else:
+                semaphore = asyncio.Semaphore(self.max_connections)
+                results = chain.from_iterable(await asyncio.gather(
+                    *(self._upload_batch(batch, semaphore) for batch in batches)
+                ))
             
-            for doc_result in result:
-                if doc_result.succeeded:
-                    successful_count += 1
-                else:
-                    failed_docs.append({
-                        "key": doc_result.key,
-                        "error": doc_result.error_message
-                    })
+            # Process results; failures are only collected when there are any
+            results = list(results)
+            successful_count = sum(doc_result.succeeded for doc_result in results)
+            failed_docs = [] if successful_count == len(results) else [
+                {"key": doc_result.key, "error": doc_result.error_message}
+                for doc_result in results
+                if not doc_result.succeeded
+            ]
             
             if failed_docs:
                 logging.warning(f"Some documents failed to upload: {failed_docs}")
@@ -113,7 +228,12 @@ class AzureSearchClient:
             logging.error(f"Error uploading documents: {e}")
             raise
     
-    def search_documents(
+    async def _upload_batch(self, batch: List[Dict[str, Any]], semaphore: asyncio.Semaphore):
+        """Upload one batch of documents once a connection slot is free."""
+        async with semaphore:
+            return await self.search_client.upload_documents(documents=batch)
+    
+    async def search_documents(
         self, 
         query: str, 
         filters: Optional[str] = None,
@@ -134,17 +254,16 @@ class AzureSearchClient:
         """
         try:
             # Perform search using official client
-            results = self.search_client.search(
+            await self._open()
+            results = await self.search_client.search(
                 search_text=query,
                 filter=filters,
                 top=top,
                 select=select_fields
             )
             
-            # Convert results to list
-            documents = []
-            for result in results:
-                documents.append(dict(result))
+            # The SDK yields plain dicts; collect them without copying
+            documents = [result async for result in results]
             
             logging.info(f"Search completed: {len(documents)} results for query '{query}'")
             
@@ -157,7 +276,7 @@ class AzureSearchClient:
             logging.error(f"Error searching documents: {e}")
             raise
     
-    def semantic_search(
+    async def semantic_search(
         self, 
         query: str, 
         embedding_vector: Optional[List[float]] = None,
@@ -168,6 +287,9 @@ class AzureSearchClient:
         """
         Perform semantic search using vector similarity.
         
+        Results of vector queries are cached in-process; a later query with
+        the same parameters and a near-identical embedding reuses them.
+        
         Args:
             query: Search query text
             embedding_vector: Query embedding vector for semantic search
@@ -187,7 +309,17 @@ class AzureSearchClient:
             }
             
             # Add vector search if embedding provided
-            if embedding_vector:
+            if embedding_vector is not None and len(embedding_vector):
+                cache_key = (query, filters, top, tuple(select_fields) if select_fields else None)
+                if self._semantic_cache is not None:
+                    cached = self._semantic_cache.get(cache_key, embedding_vector)
+                    if cached is not None:
+                        logging.info(f"Semantic search served from cache: {cached['count']} results")
+                        return cached
+                cache_vector = embedding_vector
+                if Config.AZURE_SEARCH_VECTOR_FORMAT == "int8":
+                    # Query in the same int8 space as the indexed vectors
+                    embedding_vector = int8_quantize(embedding_vector)[0].tolist()
                 vector_query = VectorizedQuery(
                     vector=embedding_vector,
                     k_nearest_neighbors=top,
@@ -196,25 +328,27 @@ class AzureSearchClient:
                 search_kwargs["vector_queries"] = [vector_query]
             
             # Perform search
-            results = self.search_client.search(**search_kwargs)
+            await self._open()
+            results = await self.search_client.search(**search_kwargs)
             
-            # Convert results to list
-            documents = []
-            for result in results:
-                documents.append(dict(result))
+            # The SDK yields plain dicts; collect them without copying
+            documents = [result async for result in results]
             
             logging.info(f"Semantic search completed: {len(documents)} results")
             
-            return {
+            result = {
                 "value": documents,
                 "count": len(documents)
             }
+            if "vector_queries" in search_kwargs and self._semantic_cache is not None:
+                self._semantic_cache.put(cache_key, cache_vector, result)
+            return result
             
         except Exception as e:
             logging.error(f"Error in semantic search: {e}")
             raise
     
-    def get_document(self, document_id: str) -> Optional[Dict[str, Any]]:
+    async def get_document(self, document_id: str) -> Optional[Dict[str, Any]]:
         """
         Retrieve a specific document by ID.
         
@@ -225,10 +359,11 @@ class AzureSearchClient:
             Document data or None if not found
         """
         try:
-            result = self.search_client.get_document(key=document_id)
+            await self._open()
+            result = await self.search_client.get_document(key=document_id)
             
             logging.info(f"Retrieved document: {document_id}")
-            return dict(result)
+            return result
             
         except Exception as e:
             if "Not Found" in str(e):
@@ -236,7 +371,56 @@ class AzureSearchClient:
             logging.error(f"Error getting document: {e}")
             raise
     
-    def delete_document(self, document_id: str) -> Dict[str, Any]:
+    async def get_documents(
+        self, 
+        document_ids: List[str], 
+        select_fields: Optional[List[str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Retrieve several documents by ID with as few requests as possible.
+        
+        IDs are looked up with a `search.in` filter, up to 100 per request,
+        and the requests run concurrently.
+        
+        Args:
+            document_ids: Document identifiers
+            select_fields: Specific fields to return; `id` is always included
+            
+        Returns:
+            Documents by ID; IDs that were not found are omitted
+        """
+        try:
+            await self._open()
+            # An ID containing the delimiter can't be a valid key, so it has no document
+            ids = [doc_id for doc_id in dict.fromkeys(document_ids) if _LOOKUP_DELIMITER not in doc_id]
+            if select_fields and "id" not in select_fields:
+                select_fields = ["id", *select_fields]
+            
+            batches = [ids[i:i + _MAX_LOOKUP_BATCH_SIZE] for i in range(0, len(ids), _MAX_LOOKUP_BATCH_SIZE)]
+            pages = await asyncio.gather(
+                *(self._get_documents_batch(batch, select_fields) for batch in batches)
+            )
+            documents = {document["id"]: document for page in pages for document in page}
+            
+            logging.info(f"Retrieved {len(documents)}/{len(ids)} documents")
+            return documents
+            
+        except Exception as e:
+            logging.error(f"Error getting documents: {e}")
+            raise
+    
+    async def _get_documents_batch(self, ids: List[str], select_fields: Optional[List[str]]) -> List[Dict[str, Any]]:
+        """Fetch one batch of documents with a single search.in query."""
+        id_list = _LOOKUP_DELIMITER.join(ids).replace("'", "''")
+        results = await self.search_client.search(
+            search_text="*",
+            filter=f"search.in(id, '{id_list}', '{_LOOKUP_DELIMITER}')",
+            top=len(ids),
+            select=select_fields
+        )
+        return [result async for result in results]
+    
+    async def delete_document(self, document_id: str) -> Dict[str, Any]:
         """
         Delete a document from the index.
         
@@ -247,9 +431,11 @@ class AzureSearchClient:
             Deletion result
         """
         try:
+            self._clear_semantic_cache()
             # Delete using official client
+            await self._open()
             documents_to_delete = [{"id": document_id}]
-            result = self.search_client.delete_documents(documents=documents_to_delete)
+            result = await self.search_client.delete_documents(documents=documents_to_delete)
             
             # Check result
             success = result[0].succeeded if result else False
@@ -269,14 +455,86 @@ class AzureSearchClient:
         except Exception as e:
             logging.error(f"Error deleting document: {e}")
             raise
+    
+    def _clear_semantic_cache(self):
+        """Drop cached semantic results; the index is about to change."""
+        if self._semantic_cache is not None:
+            self._semantic_cache.clear()
+
+
+@lru_cache(maxsize=256)
+def build_odata_filter(template: str, **params: Any) -> str:
+    """
+    Fill an OData filter template with literal values.
+    
+    Strings are quoted with embedded quotes escaped, booleans and None
+    become `true`/`false`/`null`, numbers are inserted as-is and datetimes
+    become UTC `...Z` literals. The result is cached, so hot filters are
+    built once per worker.
+    
+    Args:
+        template: Filter with `str.format` fields, e.g. "video_name eq {name}"
+        **params: Values for the template fields; must be hashable
+        
+    Returns:
+        OData filter expression
+    """
+    return template.format(**{key: _odata_literal(value) for key, value in params.items()})
+
+
+def _odata_literal(value: Any) -> str:
+    """
+    Render a Python value as an OData literal.
+    
+    Raises:
+        ValueError: For NaN or infinite floats
+        TypeError: For values without an OData literal form
+    """
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            raise ValueError(f"Non-finite number in OData filter: {value!r}")
+        return repr(value)
+    if isinstance(value, datetime):
+        # Edm.DateTimeOffset literals are unquoted ISO 8601; naive values are taken as UTC
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    raise TypeError(f"Unsupported OData filter value: {type(value).__name__}")
+
+
+def _to_json_compatible(document: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert NumPy vector fields to lists for the SDK's JSON serializer."""
+    return {
+        key: value.tolist() if isinstance(value, np.ndarray) else value
+        for key, value in document.items()
+    }
 
 
 # Global instance for reuse
 _search_client_instance = None
+_search_client_lock = threading.Lock()
 
 def get_search_client() -> AzureSearchClient:
-    """Get a singleton instance of the Azure Search client."""
+    """
+    Get a singleton instance of the Azure Search client.
+    
+    Creation is guarded by a lock because the Functions host may call in
+    from several threads; once created, the instance is returned without
+    taking the lock. It lives for the worker process and is closed by an
+    atexit hook registered when it is created.
+    """
     global _search_client_instance
     if _search_client_instance is None:
-        _search_client_instance = AzureSearchClient()
+        with _search_client_lock:
+            if _search_client_instance is None:
+                _search_client_instance = AzureSearchClient()
+                atexit.register(_search_client_instance._close_at_exit)
     return _search_client_instance
\ No newline at end of file
@@ -0,0 +1,193 @@
+"""
+In-process cache of semantic search results keyed by the query embedding.
+A query whose embedding is close enough to a cached one reuses its results.
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Sequence
+import numpy as np
+from ..utils.vectors import int8_quantize
+
+
+class SemanticCache:
+    """
+    LRU cache of search results, looked up by cosine similarity.
+
+    Entries only match queries with the same non-vector parameters (query
+    text, filters, top, selected fields), and expire after `ttl_seconds`
+    so documents indexed by other instances show up eventually.
+
+    Embeddings are stored as int8 with a per-vector scale, a quarter of
+    the float32 size, in the rows of one contiguous matrix that doubles in
+    capacity as needed. Each scale is chosen so the dequantized row has unit
+    norm, and queries are normalized too, so a lookup's cosine similarities
+    are a single float32 matrix-vector product; rows for other parameters
+    are masked out.
+
+    Results are deep-copied on the way in and out, so callers that edit a
+    returned result can't change what later hits see.
+    """
+
+    _INITIAL_CAPACITY = 16
+
+    def __init__(self, max_entries: int = 1024, threshold: float = 0.97, ttl_seconds: float = 300):
+        """
+        Args:
+            max_entries: Maximum number of cached results
+            threshold: Minimum cosine similarity for a cache hit
+            ttl_seconds: Lifetime of a cached result
+        """
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        # Row storage, allocated on the first put once the dimension is known
+        self._vectors: Optional[np.ndarray] = None
+        self._scales = np.zeros(0, dtype=np.float32)
+        self._expiry = np.zeros(0, dtype=np.float64)
+        self._param_hashes = np.zeros(0, dtype=np.int64)
+        self._live = np.zeros(0, dtype=bool)
+        self._params: List[Any] = []
+        self._results: List[Optional[Dict[str, Any]]] = []
+        # Occupied rows in LRU order, rows freed by expiry, rows ever used
+        self._lru: "OrderedDict[int, None]" = OrderedDict()
+        self._free: List[int] = []
+        self._size = 0
+
+    def get(self, params: Hashable, vector: Sequence[float]) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached result for the most similar query, if similar enough.
+
+        Args:
+            params: The query's non-vector parameters
+            vector: Query embedding vector
+
+        Returns:
+            Cached search result or None
+        """
+        query = _normalize(vector)
+        if query is None:
+            return None
+
+        with self._lock:
+            if self._vectors is None or query.shape[0] != self._vectors.shape[1]:
+                return None
+
+            n = self._size
+            mask = (
+                self._live[:n]
+                & (self._param_hashes[:n] == hash(params))
+                & (self._expiry[:n] > time.monotonic())
+            )
+            if not mask.any():
+                return None
+
+            # One BLAS sgemv over all rows; rows are int8, rescaled per row
+            # to unit norm, so these are the cosine similarities
+            scores = (self._vectors[:n].astype(np.float32) @ query) * self._scales[:n]
+            scores[~mask] = -np.inf
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold or self._params[best] != params:
+                return None
+
+            self._lru.move_to_end(best)
+            result = self._results[best]
+
+        # The stored copy is never modified, so it can be copied unlocked
+        return copy.deepcopy(result)
+
+    def put(self, params: Hashable, vector: Sequence[float], result: Dict[str, Any]) -> None:
+        """
+        Cache a search result under its query parameters and embedding.
+
+        Args:
+            params: The query's non-vector parameters
+            vector: Query embedding vector
+            result: Search result to cache
+        """
+        query = _normalize(vector)
+        if query is None or self.max_entries <= 0:
+            return
+        quantized, _ = int8_quantize(query)
+        # Fold the norm into the scale: the row, rescaled, is a unit vector
+        scale = 1.0 / float(np.linalg.norm(quantized.astype(np.float32)))
+        result = copy.deepcopy(result)
+
+        with self._lock:
+            if self._vectors is None:
+                self._grow(min(self._INITIAL_CAPACITY, self.max_entries), quantized.shape[0])
+            elif quantized.shape[0] != self._vectors.shape[1]:
+                # A different embedding model; keep the existing entries
+                return
+
+            row = self._allocate_row()
+            self._vectors[row] = quantized
+            self._scales[row] = scale
+            self._expiry[row] = time.monotonic() + self.ttl_seconds
+            self._param_hashes[row] = hash(params)
+            self._live[row] = True
+            self._params[row] = params
+            self._results[row] = result
+            self._lru[row] = None
+
+    def clear(self) -> None:
+        """Drop every cached result, e.g. after the index changed."""
+        with self._lock:
+            self._reset()
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+    def _allocate_row(self) -> int:
+        """Return a free row, evicting expired entries or the LRU entry if full."""
+        if len(self._lru) >= self.max_entries:
+            self._evict_expired()
+        if len(self._lru) >= self.max_entries:
+            row, _ = self._lru.popitem(last=False)
+            return row
+        if self._free:
+            return self._free.pop()
+        if self._size == self._vectors.shape[0]:
+            self._grow(min(2 * self._size, self.max_entries), self._vectors.shape[1])
+        self._size += 1
+        return self._size - 1
+
+    def _grow(self, capacity: int, dimension: int) -> None:
+        """Reallocate row storage with room for `capacity` entries."""
+        size = self._size
+        vectors = np.zeros((capacity, dimension), dtype=np.int8)
+        if self._vectors is not None:
+            vectors[:size] = self._vectors[:size]
+        self._vectors = vectors
+        self._scales = np.resize(self._scales, capacity)
+        self._expiry = np.resize(self._expiry, capacity)
+        self._param_hashes = np.resize(self._param_hashes, capacity)
+        live = np.zeros(capacity, dtype=bool)
+        live[:size] = self._live[:size]
+        self._live = live
+        self._params.extend([None] * (capacity - len(self._params)))
+        self._results.extend([None] * (capacity - len(self._results)))
+
+    def _evict_expired(self) -> None:
+        n = self._size
+        for row in np.flatnonzero(self._live[:n] & (self._expiry[:n] <= time.monotonic())):
+            row = int(row)
+            self._live[row] = False
+            self._params[row] = self._results[row] = None
+            del self._lru[row]
+            self._free.append(row)
+
+
+def _normalize(vector: Sequence[float]) -> Optional[np.ndarray]:
+    """L2-normalize a vector as float32, or return None for a zero or non-finite vector."""
+    vec = np.asarray(vector, dtype=np.float32)
+    norm = float(np.linalg.norm(vec))
+    if not norm or not np.isfinite(norm):
+        return None
+    return vec / norm
@@ -1,12 +1,46 @@
 """
 Shared utilities for RAG Video processing.
+
+The NumPy-based vector helpers are imported on first access (PEP 562), so
+modules that only need the configuration don't load NumPy.
 """
 
-from .config import Config, setup_logging, is_video_file, get_file_size_category
+import importlib
+
+from .config import CONFIG, Config, setup_logging, is_video_file, get_file_size_category
+from .timestamps import utcnow_iso
+
+# Public name -> defining submodule, for the lazily imported helpers
+_LAZY_IMPORTS = {
+    "quantize_int8": "vectors",
+    "dequantize_int8": "vectors",
+    "int8_values": "vectors",
+    "int8_quantize": "vectors",
+}
 
 __all__ = [
+    "CONFIG",
     "Config", 
     "setup_logging", 
     "is_video_file", 
-    "get_file_size_category"
-]
\ No newline at end of file
+    "get_file_size_category",
+    "utcnow_iso",
+    "quantize_int8",
+    "dequantize_int8",
+    "int8_values",
+    "int8_quantize"
+]
+
+
+def __getattr__(name):
+    try:
+        module_name = _LAZY_IMPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -3,59 +3,90 @@ Configuration settings and utilities for the RAG Video processing system.
 """
 
 import os
-from typing import Dict, Any
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Dict, Any, Tuple
 import logging
 
 
-class Config:
-    """Configuration settings for the application."""
+@dataclass(frozen=True, slots=True)
+class _Config:
+    """
+    Configuration settings for the application.
+    
+    Settings are read from the environment once, when the module is
+    imported; use the `CONFIG` instance (also exported as `Config`).
+    """
     
     # Azure AI Services
-    AZURE_AI_SERVICE_ENDPOINT = os.environ.get("AZURE_AI_SERVICE_ENDPOINT", "")
-    AZURE_AI_SERVICE_API_VERSION = os.environ.get("AZURE_AI_SERVICE_API_VERSION", "2024-12-01-preview")
-    AZURE_AI_SERVICE_KEY = os.environ.get("AZURE_AI_SERVICE_KEY", "")
+    AZURE_AI_SERVICE_ENDPOINT: str = os.environ.get("AZURE_AI_SERVICE_ENDPOINT", "")
+    AZURE_AI_SERVICE_API_VERSION: str = os.environ.get("AZURE_AI_SERVICE_API_VERSION", "2024-12-01-preview")
+    AZURE_AI_SERVICE_KEY: str = os.environ.get("AZURE_AI_SERVICE_KEY", "")
+    # Analyzer definition JSON; defaults to analyzer_templates/ in the repository
+    ANALYZER_TEMPLATE_PATH: str = os.environ.get("ANALYZER_TEMPLATE_PATH", "")
     
     # Azure OpenAI
-    AZURE_OPENAI_ENDPOINT = os.environ.get("AZURE_OPENAI_ENDPOINT", "")
-    AZURE_OPENAI_CHAT_DEPLOYMENT_NAME = os.environ.get("AZURE_OPENAI_CHAT_DEPLOYMENT_NAME", "")
-    AZURE_OPENAI_CHAT_API_VERSION = os.environ.get("AZURE_OPENAI_CHAT_API_VERSION", "2024-08-01-preview")
-    AZURE_OPENAI_EMBEDDING_DEPLOYMENT_NAME = os.environ.get("AZURE_OPENAI_EMBEDDING_DEPLOYMENT_NAME", "")
-    AZURE_OPENAI_EMBEDDING_API_VERSION = os.environ.get("AZURE_OPENAI_EMBEDDING_API_VERSION", "2023-05-15")
-    AZURE_OPENAI_API_KEY = os.environ.get("AZURE_OPENAI_API_KEY", "")
+    AZURE_OPENAI_ENDPOINT: str = os.environ.get("AZURE_OPENAI_ENDPOINT", "")
+    AZURE_OPENAI_CHAT_DEPLOYMENT_NAME: str = os.environ.get("AZURE_OPENAI_CHAT_DEPLOYMENT_NAME", "")
+    AZURE_OPENAI_CHAT_API_VERSION: str = os.environ.get("AZURE_OPENAI_CHAT_API_VERSION", "2024-08-01-preview")
+    AZURE_OPENAI_EMBEDDING_DEPLOYMENT_NAME: str = os.environ.get("AZURE_OPENAI_EMBEDDING_DEPLOYMENT_NAME", "")
+    AZURE_OPENAI_EMBEDDING_API_VERSION: str = os.environ.get("AZURE_OPENAI_EMBEDDING_API_VERSION", "2023-05-15")
+    AZURE_OPENAI_EMBEDDING_DIMENSION: int = int(os.environ.get("AZURE_OPENAI_EMBEDDING_DIMENSION", "1536"))
+    AZURE_OPENAI_API_KEY: str = os.environ.get("AZURE_OPENAI_API_KEY", "")
+    AZURE_OPENAI_MAX_RETRIES: int = int(os.environ.get("AZURE_OPENAI_MAX_RETRIES", "5"))
     
     # Azure Search
-    AZURE_SEARCH_ENDPOINT = os.environ.get("AZURE_SEARCH_ENDPOINT", "")
-    AZURE_SEARCH_INDEX_NAME = os.environ.get("AZURE_SEARCH_INDEX_NAME", "videos")
-    AZURE_SEARCH_API_VERSION = os.environ.get("AZURE_SEARCH_API_VERSION", "2024-07-01")
-    AZURE_SEARCH_ADMIN_KEY = os.environ.get("AZURE_SEARCH_ADMIN_KEY", "")
-    AZURE_SEARCH_QUERY_KEY = os.environ.get("AZURE_SEARCH_QUERY_KEY", "")
+    AZURE_SEARCH_ENDPOINT: str = os.environ.get("AZURE_SEARCH_ENDPOINT", "")
+    AZURE_SEARCH_INDEX_NAME: str = os.environ.get("AZURE_SEARCH_INDEX_NAME", "videos")
+    AZURE_SEARCH_API_VERSION: str = os.environ.get("AZURE_SEARCH_API_VERSION", "2024-07-01")
+    AZURE_SEARCH_ADMIN_KEY: str = os.environ.get("AZURE_SEARCH_ADMIN_KEY", "")
+    AZURE_SEARCH_QUERY_KEY: str = os.environ.get("AZURE_SEARCH_QUERY_KEY", "")
+    # "float32" or "int8" (Collection(Edm.SByte) vector fields in the index)
+    AZURE_SEARCH_VECTOR_FORMAT: str = os.environ.get("AZURE_SEARCH_VECTOR_FORMAT", "float32")
+    # In-process cache of semantic search results; 0 entries disables it
+    SEMANTIC_CACHE_MAX_ENTRIES: int = int(os.environ.get("SEMANTIC_CACHE_MAX_ENTRIES", "1024"))
+    SEMANTIC_CACHE_THRESHOLD: float = float(os.environ.get("SEMANTIC_CACHE_THRESHOLD", "0.97"))
+    SEMANTIC_CACHE_TTL_SECONDS: float = float(os.environ.get("SEMANTIC_CACHE_TTL_SECONDS", "300"))
     
     # Azure Storage
-    AZURE_STORAGE_CONNECTION_STRING = os.environ.get("AzureWebJobsStorage", "")
+    AZURE_STORAGE_CONNECTION_STRING: str = os.environ.get("AzureWebJobsStorage", "")
+    STORAGE_ACCOUNT_NAME: str = os.environ.get("STORAGE_ACCOUNT_NAME", "")
     
     # Processing Settings
-    MAX_VIDEO_SIZE_MB = int(os.environ.get("MAX_VIDEO_SIZE_MB", "500"))
-    ORCHESTRATION_TIMEOUT_MINUTES = int(os.environ.get("ORCHESTRATION_TIMEOUT_MINUTES", "60"))
-    EMBEDDING_BATCH_SIZE = int(os.environ.get("EMBEDDING_BATCH_SIZE", "16"))
+    MAX_VIDEO_SIZE_MB: int = int(os.environ.get("MAX_VIDEO_SIZE_MB", "500"))
+    ORCHESTRATION_TIMEOUT_MINUTES: int = int(os.environ.get("ORCHESTRATION_TIMEOUT_MINUTES", "60"))
+    EMBEDDING_BATCH_SIZE: int = int(os.environ.get("EMBEDDING_BATCH_SIZE", "16"))
+    EMBEDDING_MAX_CONCURRENCY: int = int(os.environ.get("EMBEDDING_MAX_CONCURRENCY", "8"))
     
     # Supported video formats
-    SUPPORTED_VIDEO_FORMATS = [
+    SUPPORTED_VIDEO_FORMATS: Tuple[str, ...] = (
         "video/mp4", "video/avi", "video/mov", "video/wmv", 
         "video/flv", "video/webm", "video/quicktime", "video/x-msvideo"
-    ]
+    )
     
-    SUPPORTED_VIDEO_EXTENSIONS = [
+    SUPPORTED_VIDEO_EXTENSIONS: Tuple[str, ...] = (
         ".mp4", ".avi", ".mov", ".wmv", ".flv", ".webm", ".mkv"
-    ]
+    )
     
-    @classmethod
-    def validate_configuration(cls) -> Dict[str, Any]:
+    def validate_configuration(self) -> Dict[str, Any]:
         """
         Validate the current configuration and return status.
         
+        Settings don't change after import, so the result for `CONFIG` is
+        computed once; each call gets its own copy.
+        
         Returns:
             Dictionary with validation results
         """
+        results = _VALIDATION_RESULT if self is CONFIG else self._compute_validation()
+        return {
+            **results,
+            "errors": list(results["errors"]),
+            "warnings": list(results["warnings"]),
+            "services": dict(results["services"])
+        }
+    
+    def _compute_validation(self) -> Dict[str, Any]:
         results = {
             "valid": True,
             "errors": [],
@@ -64,38 +95,49 @@ class Config:
         }
         
         # Check Azure AI Services
-        if not cls.AZURE_AI_SERVICE_ENDPOINT:
+        if not self.AZURE_AI_SERVICE_ENDPOINT:
             results["warnings"].append("Azure AI Service endpoint not configured - will use simulation mode")
-        results["services"]["azure_ai"] = bool(cls.AZURE_AI_SERVICE_ENDPOINT)
+        results["services"]["azure_ai"] = bool(self.AZURE_AI_SERVICE_ENDPOINT)
         
         # Check Azure OpenAI
-        if not cls.AZURE_OPENAI_ENDPOINT:
+        if not self.AZURE_OPENAI_ENDPOINT:
             results["warnings"].append("Azure OpenAI endpoint not configured - will use simulation mode")
-        results["services"]["azure_openai"] = bool(cls.AZURE_OPENAI_ENDPOINT)
+        results["services"]["azure_openai"] = bool(self.AZURE_OPENAI_ENDPOINT)
         
         # Check Azure Search
-        if not cls.AZURE_SEARCH_ENDPOINT:
+        if not self.AZURE_SEARCH_ENDPOINT:
             results["warnings"].append("Azure Search endpoint not configured - will use simulation mode")
-        results["services"]["azure_search"] = bool(cls.AZURE_SEARCH_ENDPOINT)
+        results["services"]["azure_search"] = bool(self.AZURE_SEARCH_ENDPOINT)
         
         # Check storage
-        if not cls.AZURE_STORAGE_CONNECTION_STRING or cls.AZURE_STORAGE_CONNECTION_STRING == "UseDevelopmentStorage=true":
+        if not self.AZURE_STORAGE_CONNECTION_STRING or self.AZURE_STORAGE_CONNECTION_STRING == "UseDevelopmentStorage=true":
             results["warnings"].append("Using development storage - not suitable for production")
-        results["services"]["azure_storage"] = bool(cls.AZURE_STORAGE_CONNECTION_STRING)
+        results["services"]["azure_storage"] = bool(self.AZURE_STORAGE_CONNECTION_STRING)
         
         return results
     
-    @classmethod
-    def get_service_status(cls) -> Dict[str, str]:
+    def get_service_status(self) -> Dict[str, str]:
         """Get the status of all configured services."""
+        return dict(_SERVICE_STATUS if self is CONFIG else self._compute_service_status())
+    
+    def _compute_service_status(self) -> Dict[str, str]:
         return {
-            "azure_ai": "configured" if cls.AZURE_AI_SERVICE_ENDPOINT else "simulation",
-            "azure_openai": "configured" if cls.AZURE_OPENAI_ENDPOINT else "simulation", 
-            "azure_search": "configured" if cls.AZURE_SEARCH_ENDPOINT else "simulation",
-            "azure_storage": "configured" if cls.AZURE_STORAGE_CONNECTION_STRING and cls.AZURE_STORAGE_CONNECTION_STRING != "UseDevelopmentStorage=true" else "development"
+            "azure_ai": "configured" if self.AZURE_AI_SERVICE_ENDPOINT else "simulation",
+            "azure_openai": "configured" if self.AZURE_OPENAI_ENDPOINT else "simulation", 
+            "azure_search": "configured" if self.AZURE_SEARCH_ENDPOINT else "simulation",
+            "azure_storage": "configured" if self.AZURE_STORAGE_CONNECTION_STRING and self.AZURE_STORAGE_CONNECTION_STRING != "UseDevelopmentStorage=true" else "development"
         }
 
 
+# Settings for this worker; `Config` keeps the historical name
+CONFIG = _Config()
+Config = CONFIG
+
+# Results of CONFIG.validate_configuration and CONFIG.get_service_status
+_VALIDATION_RESULT = CONFIG._compute_validation()
+_SERVICE_STATUS = CONFIG._compute_service_status()
+
+
 def setup_logging(level: str = "INFO") -> None:
     """
     Set up logging configuration.
@@ -109,6 +151,11 @@ def setup_logging(level: str = "INFO") -> None:
     )
 
 
+# Lookup forms of the supported formats for is_video_file
+_VIDEO_FORMATS = frozenset(Config.SUPPORTED_VIDEO_FORMATS)
+_VIDEO_EXTENSIONS = tuple(Config.SUPPORTED_VIDEO_EXTENSIONS)
+
+
 def is_video_file(content_type: str = None, filename: str = None) -> bool:
     """
     Check if a file is a supported video format.
@@ -120,13 +167,15 @@ def is_video_file(content_type: str = None, filename: str = None) -> bool:
     Returns:
         True if the file is a supported video format
     """
-    if content_type and content_type.lower() in Config.SUPPORTED_VIDEO_FORMATS:
+    if content_type and content_type.lower() in _VIDEO_FORMATS:
         return True
     
-    if filename:
-        return any(filename.lower().endswith(ext) for ext in Config.SUPPORTED_VIDEO_EXTENSIONS)
-    
-    return False
+    return bool(filename) and filename.lower().endswith(_VIDEO_EXTENSIONS)
+
+
+# Upper bounds (exclusive, in MB) of every size category but the last
+_SIZE_THRESHOLDS_MB = (10, 100, 500)
+_SIZE_CATEGORIES = ("small", "medium", "large", "extra_large")
 
 
 def get_file_size_category(size_mb: float) -> str:
@@ -139,11 +188,4 @@ def get_file_size_category(size_mb: float) -> str:
     Returns:
         Size category string
     """
-    if size_mb < 10:
-        return "small"
-    elif size_mb < 100:
-        return "medium" 
-    elif size_mb < 500:
-        return "large"
-    else:
-        return "extra_large"
\ No newline at end of file
+    return _SIZE_CATEGORIES[bisect_right(_SIZE_THRESHOLDS_MB, size_mb)]
\ No newline at end of file
@@ -0,0 +1,20 @@
+"""
+Fast UTC timestamp formatting for response payloads.
+"""
+
+import time
+
+
+def utcnow_iso() -> str:
+    """
+    Get the current UTC time as an ISO 8601 string.
+    
+    Same format as `datetime.now(timezone.utc).isoformat()` (always with
+    microseconds), built from `time.time()` without creating a datetime.
+    
+    Returns:
+        Timestamp like 2024-01-01T12:00:00.000000+00:00
+    """
+    now = time.time()
+    seconds = int(now)
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds)) + f".{int((now - seconds) * 1e6):06d}+00:00"
@@ -0,0 +1,69 @@
+"""
+Compact encoding of embedding vectors passed between activities.
+"""
+
+import base64
+from typing import Any, Dict, Sequence, Tuple, Union
+
+import numpy as np
+
+
+def quantize_int8(vector: Union[Sequence[float], np.ndarray]) -> Dict[str, Any]:
+    """
+    Quantize an embedding vector to int8 with a per-vector scale.
+    
+    Args:
+        vector: Embedding vector
+        
+    Returns:
+        Dictionary with the base64-encoded int8 values, the scale and the dimension
+    """
+    quantized, scale = int8_quantize(vector)
+    
+    return {
+        "vector_q8": base64.b64encode(quantized.tobytes()).decode("ascii"),
+        "scale": scale,
+        "dimension": int(quantized.size)
+    }
+
+
+def int8_quantize(vector: Union[Sequence[float], np.ndarray]) -> Tuple[np.ndarray, float]:
+    """
+    Quantize an embedding vector to raw int8 values with a per-vector scale.
+    
+    Args:
+        vector: Embedding vector
+        
+    Returns:
+        Tuple of the int8 values and the scale that maps them back to floats
+    """
+    values = np.asarray(vector, dtype=np.float32)
+    max_abs = float(np.abs(values).max()) if values.size else 0.0
+    scale = max_abs / 127 if max_abs else 1.0
+    return np.round(values / scale).astype(np.int8), scale
+
+
+def dequantize_int8(encoded: Dict[str, Any]) -> np.ndarray:
+    """
+    Decode a vector produced by `quantize_int8`.
+    
+    Args:
+        encoded: Dictionary with `vector_q8` and `scale` keys
+        
+    Returns:
+        float32 embedding vector
+    """
+    return int8_values(encoded).astype(np.float32) * np.float32(encoded["scale"])
+
+
+def int8_values(encoded: Dict[str, Any]) -> np.ndarray:
+    """
+    Decode the raw int8 values of a vector produced by `quantize_int8`.
+    
+    Args:
+        encoded: Dictionary with a `vector_q8` key
+        
+    Returns:
+        int8 vector, without the scale applied
+    """
+    return np.frombuffer(base64.b64decode(encoded["vector_q8"]), dtype=np.int8)